@@ -22,7 +22,7 @@ block_cipher = None
 # Collect all submodules for packages that need them
 hidden_imports = [
     'PIL', 'PIL.Image', 'numpy', 'pytesseract',
-    'cv2', 'pynput', 'pynput.keyboard', 'pynput.mouse',
+    'cv2', 'pynput', 'pynput.keyboard', 'pynput.mouse', 'mss', 'orjson', 'rapidfuzz',
 ]
 
 excludes = [
@@ -37,6 +37,7 @@ excludes = [
 # pydirectinput is Windows-only
 if sys.platform == 'win32':
     hidden_imports.append('pydirectinput')
+    hidden_imports.append('dxcam')
 
 # Platform-specific binaries
 binaries = []
@@ -11,148 +11,232 @@ Usage:
 """
 
 import sys
-import argparse
 
 
-def main():
+def run_set_region():
+    """Set game region interactively by hovering over two corners."""
+    import time
+    import threading
+    from src.config import load_json, dump_json
+
+    # Import pyautogui and read config.json on a worker thread so the
+    # cost hides under the countdowns below
+    preloaded = {}
+
+    def preload():
+        # Errors are handed back to the main thread, which re-raises them
+        try:
+            import pyautogui
+            preloaded["pyautogui"] = pyautogui
+            preloaded["config"] = load_json("config.json")
+        except Exception as e:
+            preloaded["error"] = e
+
+    loader = threading.Thread(target=preload, daemon=True)
+    loader.start()
+
+    print("=== Set Game Region ===")
+    print("1. Press ENTER, then you have 3 seconds to move mouse to TOP-LEFT corner")
+    print("2. Press ENTER again, then 3 seconds to move mouse to BOTTOM-RIGHT corner")
+    print()
+
+    input("Press ENTER, then move mouse to TOP-LEFT corner...")
+    for i in range(3, 0, -1):
+        print(f"  {i}...")
+        time.sleep(1)
+    loader.join()
+    if "error" in preloaded:
+        raise preloaded["error"]
+    pyautogui = preloaded["pyautogui"]
+    pos1 = pyautogui.position()
+    print(f"Got top-left: ({pos1.x}, {pos1.y})")
+
+    input("Press ENTER, then move mouse to BOTTOM-RIGHT corner...")
+    for i in range(3, 0, -1):
+        print(f"  {i}...")
+        time.sleep(1)
+    pos2 = pyautogui.position()
+    print(f"Got bottom-right: ({pos2.x}, {pos2.y})")
+
+    # Calculate region - one subtraction per axis gives both origin and size
+    dx = pos2.x - pos1.x
+    dy = pos2.y - pos1.y
+    left, width = (pos1.x, dx) if dx >= 0 else (pos2.x, -dx)
+    top, height = (pos1.y, dy) if dy >= 0 else (pos2.y, -dy)
+
+    region = [int(left), int(top), int(width), int(height)]
+    print(f"\nRegion: {region}")
+
+    # Update config.json
+    config = preloaded["config"]
+    config["monitor_region"] = region
+    dump_json(config, "config.json")
+    print(f"Saved to config.json!")
+
+
+def run_capture_template(template_name: str):
+    """Interactive template capture - click to capture region around mouse."""
+    from pynput.mouse import Events
+    from src.screen_capture import grab_image, save_template_cache
+
+    print(f"=== Template Capture: {template_name} ===")
+    print("Click on the CENTER of the item you want to capture.")
+    print("A 60x60 region around your click will be saved.")
+    print("Press Ctrl+C to cancel.\n")
+
+    # Read mouse events until the first press
+    click_pos = None
+    with Events() as events:
+        for event in events:
+            if isinstance(event, Events.Click) and event.pressed:
+                click_pos = (int(event.x), int(event.y))
+                break
+
+    if click_pos:
+        x, y = click_pos
+        # Capture 60x60 region centered on click
+        size = 60
+        region = (x - size//2, y - size//2, size, size)
+        screenshot = grab_image(region)
+
+        path = f"templates/{template_name}.png"
+        screenshot.save(path)
+        save_template_cache(path, screenshot)
+        print(f"Saved {size}x{size} template to: {path}")
+        print(f"Captured at click position: ({x}, {y})")
+
+
+def run_capture(template_name: str):
+    """Quick template capture mode - full screenshot after a short delay."""
+    from src.screen_capture import ScreenCapture
+    import time
+    print(f"Capturing '{template_name}' template in 3 seconds...")
+    print("Position your screen so the item is visible!")
+    time.sleep(3)
+    ScreenCapture.save_screenshot(f"templates/{template_name}.png")
+    print("Done! You may need to crop the image to just the item.")
+
+
+def _stop_on_signal(buyer, sig, frame):
+    """SIGINT/SIGTERM handler for headless mode (bound to a buyer via partial)."""
+    print("\nStopping...")
+    buyer.stop()
+    sys.exit(0)
+
+
+def run_headless(matcher: str = None, use_gpu: bool = False, use_simd: bool = None):
+    """Run the auto-buyer without GUI using config.json settings."""
+    from src.config import Config
+    from src.auto_buyer import AutoBuyer
+    import functools
+    import os
+    import signal
+
+    config = Config()
+    if matcher:
+        # Command-line override for this run only - not saved to config.json
+        config.data["matcher"] = matcher
+    if use_gpu:
+        config.data["use_gpu"] = True
+    if use_simd is not None:
+        config.data["use_simd"] = use_simd
+    buyer = AutoBuyer(config)
+
+    handler = functools.partial(_stop_on_signal, buyer)
+    signal.signal(signal.SIGINT, handler)
+    signal.signal(signal.SIGTERM, handler)
+
+    if not buyer.load_templates():
+        print("Error: Could not load templates. Create them first with:")
+        print("  python main.py --capture mythical_egg")
+        print("  python main.py --capture buy_button")
+        sys.exit(1)
+
+    print("Starting auto-buyer in headless mode...")
+    print("Press Ctrl+C to stop")
+    buyer.start()
+
+    try:
+        if os.name == "posix":
+            # Park in the kernel until SIGINT/SIGTERM arrives - no wakeups at all
+            while buyer.running:
+                signal.pause()
+        else:
+            # Block until the signal handler calls stop(). Use a bounded wait so
+            # the main thread keeps returning to bytecode - an untimed lock
+            # acquire can't be interrupted by Ctrl+C on Windows
+            while not buyer.wait_stopped(1.0):
+                pass
+    except KeyboardInterrupt:
+        buyer.stop()
+
+
+def run_gui():
+    """Start the Tkinter GUI."""
+    from src.gui import BotGUI
+    app = BotGUI()
+    app.run()
+
+
+# Launch modes that take no extra arguments - dispatched straight from
+# sys.argv so the common paths never build the argparse parser
+FAST_PATHS = {
+    None: run_gui,
+    "--headless": run_headless,
+    "--set-region": run_set_region,
+}
+
+
+# Template names accepted by --capture (interned: argparse compares choices by identity first)
+CAPTURE_CHOICES = tuple(sys.intern(name) for name in ("mythical_egg", "buy_button"))
+
+_parser = None
+
+
+def get_parser():
+    """Build the argument parser once and reuse it on later main() calls."""
+    global _parser
+    if _parser is not None:
+        return _parser
+
+    import argparse
+
     parser = argparse.ArgumentParser(description="Magic Garden Auto-Buyer Bot")
     parser.add_argument("--headless", action="store_true", help="Run without GUI")
     parser.add_argument("--capture", type=str, help="Capture a template screenshot",
-                        choices=["mythical_egg", "buy_button"])
+                        choices=CAPTURE_CHOICES)
     parser.add_argument("--capture-template", type=str, metavar="NAME",
                         help="Interactive template capture - click on item to capture (e.g., sunflower_seed)")
     parser.add_argument("--set-region", action="store_true",
                         help="Set game region by clicking two corners, saves to config.json")
-    args = parser.parse_args()
+    parser.add_argument("--matcher", choices=["spatial", "fft", "pyramid"],
+                        help="Template matching strategy for headless mode (default: config.json 'matcher', else pyramid)")
+    parser.add_argument("--gpu", action="store_true",
+                        help="Use GPU template matching in headless mode (CUDA, else OpenCL) when OpenCV supports it")
+    parser.add_argument("--simd", action=argparse.BooleanOptionalAction, default=None,
+                        help="Enable OpenCV's SIMD/IPP optimized kernels in headless mode (default: on)")
+    _parser = parser
+    return parser
 
-    if args.set_region:
-        # Set game region interactively
-        import pyautogui
-        import json
-        import time
-
-        print("=== Set Game Region ===")
-        print("1. Press ENTER, then you have 3 seconds to move mouse to TOP-LEFT corner")
-        print("2. Press ENTER again, then 3 seconds to move mouse to BOTTOM-RIGHT corner")
-        print()
-
-        input("Press ENTER, then move mouse to TOP-LEFT corner...")
-        for i in range(3, 0, -1):
-            print(f"  {i}...")
-            time.sleep(1)
-        pos1 = pyautogui.position()
-        print(f"Got top-left: ({pos1.x}, {pos1.y})")
-
-        input("Press ENTER, then move mouse to BOTTOM-RIGHT corner...")
-        for i in range(3, 0, -1):
-            print(f"  {i}...")
-            time.sleep(1)
-        pos2 = pyautogui.position()
-        print(f"Got bottom-right: ({pos2.x}, {pos2.y})")
-
-        # Calculate region
-        left = min(pos1.x, pos2.x)
-        top = min(pos1.y, pos2.y)
-        width = abs(pos2.x - pos1.x)
-        height = abs(pos2.y - pos1.y)
-
-        region = [int(left), int(top), int(width), int(height)]
-        print(f"\nRegion: {region}")
-
-        # Update config.json
-        with open("config.json", "r") as f:
-            config = json.load(f)
-        config["monitor_region"] = region
-        with open("config.json", "w") as f:
-            json.dump(config, f, indent=4)
-        print(f"Saved to config.json!")
-        return
 
-    if args.capture_template:
-        # Interactive template capture - click to capture region around mouse
-        import pyautogui
-        from pynput import mouse
-        from PIL import Image
-
-        template_name = args.capture_template
-        print(f"=== Template Capture: {template_name} ===")
-        print("Click on the CENTER of the item you want to capture.")
-        print("A 60x60 region around your click will be saved.")
-        print("Press Ctrl+C to cancel.\n")
-
-        click_pos = None
-
-        def on_click(x, y, button, pressed):
-            nonlocal click_pos
-            if pressed:
-                click_pos = (int(x), int(y))
-                return False
-
-        listener = mouse.Listener(on_click=on_click)
-        listener.start()
-        listener.join()
-
-        if click_pos:
-            x, y = click_pos
-            # Capture 60x60 region centered on click
-            size = 60
-            region = (x - size//2, y - size//2, size, size)
-            screenshot = pyautogui.screenshot(region=region)
-
-            path = f"templates/{template_name}.png"
-            screenshot.save(path)
-            print(f"Saved {size}x{size} template to: {path}")
-            print(f"Captured at click position: ({x}, {y})")
-        return
-
-    if args.capture:
-        # Quick template capture mode
-        from src.screen_capture import ScreenCapture
-        import time
-        print(f"Capturing '{args.capture}' template in 3 seconds...")
-        print("Position your screen so the item is visible!")
-        time.sleep(3)
-        ScreenCapture.save_screenshot(f"templates/{args.capture}.png")
-        print("Done! You may need to crop the image to just the item.")
+def main():
+    cmd = sys.argv[1] if len(sys.argv) > 1 else None
+    if len(sys.argv) <= 2 and cmd in FAST_PATHS:
+        FAST_PATHS[cmd]()
         return
 
-    if args.headless:
-        # Headless mode
-        from src.config import Config
-        from src.auto_buyer import AutoBuyer
-        import time
-        import signal
-
-        config = Config()
-        buyer = AutoBuyer(config)
+    args = get_parser().parse_args()
 
-        def signal_handler(sig, frame):
-            print("\nStopping...")
-            buyer.stop()
-            sys.exit(0)
-
-        signal.signal(signal.SIGINT, signal_handler)
-
-        if not buyer.load_templates():
-            print("Error: Could not load templates. Create them first with:")
-            print("  python main.py --capture mythical_egg")
-            print("  python main.py --capture buy_button")
-            sys.exit(1)
-
-        print("Starting auto-buyer in headless mode...")
-        print("Press Ctrl+C to stop")
-        buyer.start()
-
-        try:
-            while buyer.running:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            buyer.stop()
+    if args.set_region:
+        run_set_region()
+    elif args.capture_template:
+        run_capture_template(args.capture_template)
+    elif args.capture:
+        run_capture(args.capture)
+    elif args.headless:
+        run_headless(matcher=args.matcher, use_gpu=args.gpu, use_simd=args.simd)
     else:
-        # GUI mode
-        from src.gui import BotGUI
-        app = BotGUI()
-        app.run()
+        run_gui()
 
 
 if __name__ == "__main__":
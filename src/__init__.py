@@ -1,6 +1,25 @@
-from .config import Config
-from .screen_capture import ScreenCapture
-from .auto_buyer import AutoBuyer
-from .gui import BotGUI
+import importlib
 
 __all__ = ['Config', 'ScreenCapture', 'AutoBuyer', 'BotGUI']
+
+# Resolve exports on first access so importing one submodule doesn't
+# drag in OpenCV/tesseract/tkinter for the others
+_modules = {
+    'Config': '.config',
+    'ScreenCapture': '.screen_capture',
+    'AutoBuyer': '.auto_buyer',
+    'BotGUI': '.gui',
+}
+
+
+def __getattr__(name):
+    if name in _modules:
+        module = importlib.import_module(_modules[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
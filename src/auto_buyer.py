@@ -1,18 +1,29 @@
 import time
 import threading
+import queue
 import platform
 import pyautogui
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Callable, Tuple, List
 from .screen_capture import ScreenCapture
 from .config import Config
 
 # For active window detection on macOS
 try:
-    from Quartz import CGWindowListCopyWindowInfo, kCGWindowListOptionOnScreenOnly, kCGNullWindowID
+    from Quartz import (CGWindowListCopyWindowInfo, kCGWindowListOptionOnScreenOnly,
+                        kCGWindowListExcludeDesktopElements, kCGNullWindowID)
     HAS_QUARTZ = True
 except ImportError:
     HAS_QUARTZ = False
 
+# Posting mouse events directly skips pyautogui's per-event sleeps on macOS
+try:
+    from Quartz import (CGEventCreate, CGEventCreateMouseEvent, CGEventGetLocation, CGEventPost,
+                        kCGEventLeftMouseDown, kCGEventLeftMouseUp, kCGHIDEventTap, kCGMouseButtonLeft)
+    HAS_QUARTZ_EVENTS = True
+except ImportError:
+    HAS_QUARTZ_EVENTS = False
+
 # For DirectInput on Windows (games ignore pyautogui virtual keys)
 IS_WINDOWS = platform.system() == "Windows"
 if IS_WINDOWS:
@@ -31,11 +42,75 @@ else:
 pyautogui.FAILSAFE = True  # Move mouse to corner to abort
 pyautogui.PAUSE = 0.1
 
+# Raw SendInput keyboard events, so a whole key combo goes out in one call
+# instead of one pydirectinput call (and PAUSE sleep) per key
+if IS_WINDOWS and HAS_DIRECTINPUT:
+    import ctypes
+    from ctypes import wintypes
+
+    INPUT_MOUSE = 0
+    INPUT_KEYBOARD = 1
+    MOUSEEVENTF_LEFTDOWN = 0x0002
+    MOUSEEVENTF_LEFTUP = 0x0004
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_SCANCODE = 0x0008
+    _EXTENDED_KEYS = {"up", "down", "left", "right"}  # Need KEYEVENTF_EXTENDEDKEY + NumLock handling
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG))]
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG))]
+
+    class _INPUT(ctypes.Structure):
+        # The union must include MOUSEINPUT (the largest member) so sizeof(INPUT) is right
+        class _U(ctypes.Union):
+            _fields_ = [("ki", _KEYBDINPUT), ("mi", _MOUSEINPUT)]
+        _anonymous_ = ("u",)
+        _fields_ = [("type", wintypes.DWORD), ("u", _U)]
+
+    def _send_scancodes(scancodes, key_up: bool):
+        """Send one SendInput batch of scancode key-down (or key-up) events."""
+        flags = KEYEVENTF_SCANCODE | (KEYEVENTF_KEYUP if key_up else 0)
+        events = (_INPUT * len(scancodes))()
+        for event, scancode in zip(events, scancodes):
+            event.type = INPUT_KEYBOARD
+            event.ki = _KEYBDINPUT(0, scancode, flags, 0, None)
+        ctypes.windll.user32.SendInput(len(scancodes), events, ctypes.sizeof(_INPUT))
+
+    def _send_keys(keys, hold: float = 0.02) -> bool:
+        """Press keys together (down in order, up in reverse) as hardware scancodes.
+
+        Returns False if a key needs pydirectinput's own handling (unknown or
+        an extended key such as the arrows).
+        """
+        if any(key in _EXTENDED_KEYS for key in keys):
+            return False
+        scancodes = [pydirectinput.KEYBOARD_MAPPING.get(key) for key in keys]
+        if None in scancodes:
+            return False
+        _send_scancodes(scancodes, key_up=False)
+        time.sleep(hold)  # Games that poll key state once per frame need the key held briefly
+        _send_scancodes(scancodes[::-1], key_up=True)
+        return True
+
+    def _send_left_click():
+        """Send a left button down+up at the cursor as one SendInput batch."""
+        events = (_INPUT * 2)()
+        for event, flags in zip(events, (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP)):
+            event.type = INPUT_MOUSE
+            event.mi = _MOUSEINPUT(0, 0, 0, flags, 0, None)
+        ctypes.windll.user32.SendInput(2, events, ctypes.sizeof(_INPUT))
+
 
 def _press_key(key: str):
     """Press a key using DirectInput on Windows, pyautogui otherwise."""
     if IS_WINDOWS and HAS_DIRECTINPUT:
-        pydirectinput.press(key)
+        if not _send_keys([key]):
+            pydirectinput.press(key)
     else:
         pyautogui.press(key)
 
@@ -43,21 +118,47 @@ def _press_key(key: str):
 def _hotkey(*keys):
     """Press a hotkey combo using DirectInput on Windows, pyautogui otherwise."""
     if IS_WINDOWS and HAS_DIRECTINPUT:
-        # pydirectinput doesn't have hotkey(), so we do it manually
-        for key in keys:
-            pydirectinput.keyDown(key)
-        for key in reversed(keys):
-            pydirectinput.keyUp(key)
+        if not _send_keys(keys):
+            # pydirectinput doesn't have hotkey(), so we do it manually
+            for key in keys:
+                pydirectinput.keyDown(key)
+            for key in reversed(keys):
+                pydirectinput.keyUp(key)
     else:
         pyautogui.hotkey(*keys)
 
 
+def _to_screen(region: Optional[Tuple[int, int, int, int]], x: int, y: int) -> Tuple[int, int]:
+    """Convert frame coordinates to screen coordinates (frames start at the region's corner)."""
+    if region:
+        return x + region[0], y + region[1]
+    return x, y
+
+
 def _move_to(x: int, y: int):
     """Move mouse to position. Use pyautogui (works better for mouse movement)."""
     # Always use pyautogui for mouse movement - pydirectinput has coordinate issues
     pyautogui.moveTo(x, y)
 
 
+def _click_here():
+    """Left-click at the current cursor position with no pyautogui PAUSE.
+
+    Posts the events straight to the OS where possible (Quartz, SendInput),
+    keeping pyautogui's fail-safe corner check.
+    """
+    if HAS_QUARTZ_EVENTS:
+        pyautogui.failSafeCheck()
+        pos = CGEventGetLocation(CGEventCreate(None))
+        for event_type in (kCGEventLeftMouseDown, kCGEventLeftMouseUp):
+            CGEventPost(kCGHIDEventTap, CGEventCreateMouseEvent(None, event_type, pos, kCGMouseButtonLeft))
+    elif IS_WINDOWS and HAS_DIRECTINPUT:
+        pyautogui.failSafeCheck()
+        _send_left_click()
+    else:
+        pyautogui.click(_pause=False)
+
+
 def _click(x: int = None, y: int = None):
     """Click at position (or current position if no coords) using DirectInput on Windows."""
     if IS_WINDOWS and HAS_DIRECTINPUT:
@@ -75,16 +176,43 @@ def _click(x: int = None, y: int = None):
 class AutoBuyer:
     def __init__(self, config: Config):
         self.config = config
-        self.screen = ScreenCapture(config.get("confidence_threshold", 0.8))
+        self.screen = ScreenCapture(config.get("confidence_threshold", 0.8),
+                                    matcher=config.get("matcher", "pyramid"),
+                                    use_gpu=config.get("use_gpu", False),
+                                    use_simd=config.get("use_simd", True),
+                                    workers=config.get("workers"),
+                                    use_fp16=config.get("use_fp16", False),
+                                    ocr_scale=config.get("ocr_downscale", 1.0))
         self.running = False
         self.paused = False
         self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()  # Set while not paused
 
         # Stats
         self.items_detected = 0
         self.items_purchased = 0
         self.last_detection_time: Optional[float] = None
 
+        # Runs OCR (tesseract releases the GIL) alongside mouse moves in the buy loop
+        self._ocr_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr")
+
+        # Last frontmost-window lookup as (frontmost app pid, time, region)
+        self._window_cache: Optional[Tuple[Optional[int], float, Optional[Tuple[int, int, int, int]]]] = None
+
+        # Where the last buy button sat relative to its item - every row's
+        # accordion has the same layout, so the next one is usually there too
+        self._buy_offset: Optional[Tuple[int, int]] = None
+
+        # Log messages are printed and passed to on_status_change by a
+        # background thread, so stdout/GUI latency never stalls capture or OCR
+        self._log_queue: queue.Queue = queue.Queue(maxsize=2048)
+        threading.Thread(target=self._drain_log, daemon=True, name="log").start()
+
+        # Where a template can appear, as (x0, y0, x1, y1) fractions of the
+        # captured region - only the open_egg_shop lookup reads this so far
+        self.rois = config.get("rois", {})
+
         # Navigation state
         self.in_shop = False
         self.game_region: Optional[Tuple[int, int, int, int]] = None
@@ -94,6 +222,15 @@ class AutoBuyer:
         self.on_purchase: Optional[Callable[[str], None]] = None
         self.on_status_change: Optional[Callable[[str], None]] = None
 
+    def _roi(self, name: str, screen) -> Optional[Tuple[int, int, int, int]]:
+        """Pixel (x0, y0, x1, y1) box for a configured ROI on this frame, or None for the whole frame."""
+        fractions = self.rois.get(name)
+        if not fractions:
+            return None
+        h, w = screen.shape[:2]
+        fx0, fy0, fx1, fy1 = fractions
+        return (int(fx0 * w), int(fy0 * h), int(fx1 * w), int(fy1 * h))
+
     def load_templates(self) -> bool:
         """Load all template images from config."""
         templates = self.config.get("templates", {})
@@ -106,6 +243,7 @@ class AutoBuyer:
             else:
                 self._log(f"Loaded template: {name}")
 
+        self._flush_log()  # Report before callers print their own errors
         return success
 
     def start(self):
@@ -115,6 +253,8 @@ class AutoBuyer:
 
         self.running = True
         self.paused = False
+        self._stop_event.clear()
+        self._resume_event.set()
 
         # Use monitor_region from config
         self.game_region = self.config.get("monitor_region")
@@ -122,41 +262,60 @@ class AutoBuyer:
             self._log(f"Using config region: {self.game_region}")
         else:
             self._log("No region configured - using full screen")
+        self.screen.start_stream(self.game_region)
 
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        # Load the fp16 easyocr models during the startup delay rather than
+        # in the middle of the first shop cycle
+        if self.config.get("use_fp16", False):
+            threading.Thread(target=self._warm_up_ocr, daemon=True).start()
 
-        # Startup delay to let user focus the game window
+        # Startup delay to let user focus the game window - waited out on the
+        # loop thread so the caller (the Tk event loop in GUI mode) isn't frozen
         startup_delay = self.config.get("startup_delay", 3)
         if startup_delay > 0:
             self._log(f"Starting in {startup_delay}s - focus the game window!")
-            time.sleep(startup_delay)
 
-        self._log("Auto-buyer started")
+        self._thread = threading.Thread(target=self._run_loop, args=(startup_delay,), daemon=True)
+        self._thread.start()
+
+    def _warm_up_ocr(self):
+        """Background easyocr warm-up; failures only mean a slower first OCR call."""
+        try:
+            self.screen.warm_up_easyocr()
+        except Exception as e:
+            self._log(f"EasyOCR warm-up failed: {e}")
 
     def _wait_for_two_click_region(self, timeout: float = 30.0) -> Optional[Tuple[int, int, int, int]]:
-        """Wait for user to position mouse with countdown."""
-        import pyautogui
-
-        # First corner
-        self._log("Press ENTER, then move mouse to TOP-LEFT corner (3 sec countdown)...")
-        input()
-        for i in range(3, 0, -1):
-            self._log(f"  {i}...")
-            time.sleep(1)
-        pos1 = pyautogui.position()
-        x1, y1 = int(pos1.x), int(pos1.y)
-        self._log(f"Got top-left: ({x1}, {y1})")
-
-        # Second corner
-        self._log("Press ENTER, then move mouse to BOTTOM-RIGHT corner (3 sec countdown)...")
-        input()
-        for i in range(3, 0, -1):
-            self._log(f"  {i}...")
-            time.sleep(1)
-        pos2 = pyautogui.position()
-        x2, y2 = int(pos2.x), int(pos2.y)
-        self._log(f"Got bottom-right: ({x2}, {y2})")
+        """Wait for the user to click the TOP-LEFT then BOTTOM-RIGHT corner.
+
+        Clicks are read with a global mouse hook, so this returns as soon as
+        the second click lands and never blocks on the console.
+
+        Returns:
+            (left, top, width, height), or None if both clicks didn't arrive within timeout
+        """
+        from pynput import mouse
+
+        positions = []
+        done = threading.Event()
+
+        def on_click(x, y, button, pressed):
+            if not pressed:
+                return True
+            positions.append((int(x), int(y)))
+            self._log(f"Got {'top-left' if len(positions) == 1 else 'bottom-right'}: {positions[-1]}")
+            if len(positions) == 2:
+                done.set()
+                return False  # Stop the listener
+            return True
+
+        self._log("Click the TOP-LEFT corner, then the BOTTOM-RIGHT corner of the game window...")
+        with mouse.Listener(on_click=on_click):
+            if not done.wait(timeout):
+                self._log(f"Region selection timed out after {timeout:.0f}s")
+                return None
+
+        (x1, y1), (x2, y2) = positions
 
         # Ensure top-left and bottom-right are correct
         left = min(x1, x2)
@@ -173,33 +332,73 @@ class AutoBuyer:
     def stop(self):
         """Stop the auto-buyer."""
         self.running = False
+        self._stop_event.set()
+        self._resume_event.set()  # Wake the loop if it is parked while paused
         if self._thread:
             self._thread.join(timeout=2.0)
             self._thread = None
+        self.screen.stop_stream()
         self._log("Auto-buyer stopped")
+        self._flush_log()
+
+    def wait_stopped(self, timeout: float) -> bool:
+        """Block until stop() is called or `timeout` elapses; True once stopped.
+
+        Call it in a loop with a short timeout: an untimed wait can't be
+        interrupted by Ctrl+C on Windows.
+        """
+        return self._stop_event.wait(timeout)
 
     def toggle_pause(self):
         """Toggle pause state."""
         self.paused = not self.paused
+        if self.paused:
+            self._resume_event.clear()
+        else:
+            self._resume_event.set()
         status = "paused" if self.paused else "resumed"
         self._log(f"Auto-buyer {status}")
 
-    def _run_loop(self):
+    def _run_loop(self, startup_delay: float = 0):
         """Main loop: navigate shop and buy items."""
-        scan_interval = self.config.get("scan_interval", 0.5)
+        base_interval = self.config.get("scan_interval", 0.5)
+        # Back off only a little by default, so a restock is still seen soon
+        max_interval = max(self.config.get("max_scan_interval") or base_interval * 4, base_interval)
         region = self.config.get("monitor_region")
 
+        # stop() during the delay returns immediately
+        if startup_delay > 0 and self._stop_event.wait(startup_delay):
+            return
+        self._log("Auto-buyer started")
+
+        scan_interval = base_interval
         while self.running:
             if self.paused:
-                time.sleep(0.1)
+                # Parked until toggle_pause() or stop() sets the event - no polling
+                self._resume_event.wait()
                 continue
 
+            # Pace cycles from their start time so a long cycle isn't followed
+            # by a full extra scan_interval of idle time
+            cycle_start = time.monotonic()
+            purchased_before = self.items_purchased
             try:
                 self._shop_cycle(region)
             except Exception as e:
                 self._log(f"Error during shop cycle: {e}")
 
-            time.sleep(scan_interval)
+            # Back off while the shop keeps coming up empty; rescan at the base
+            # rate as soon as something is bought
+            if self.items_purchased > purchased_before:
+                scan_interval = base_interval
+            elif scan_interval < max_interval:
+                scan_interval = min(scan_interval * 1.5, max_interval)
+                self._log(f"Nothing bought - cycles now start every {scan_interval:.1f}s")
+
+            # Deadline uses the interval just chosen, so a purchase rescans at the
+            # base rate right away. Wait on the stop event so stop() doesn't have
+            # to outlast the interval
+            self._stop_event.wait(max(0.0, cycle_start + scan_interval - time.monotonic()))
 
     def _dismiss_popups(self, region: Optional[Tuple[int, int, int, int]]) -> bool:
         """Check for and dismiss any pop-ups (daily bread, daily streak, etc.).
@@ -212,14 +411,10 @@ class AutoBuyer:
 
         if close_btn:
             rel_x, rel_y = close_btn
-            if region:
-                abs_x = rel_x + region[0]
-                abs_y = rel_y + region[1]
-            else:
-                abs_x, abs_y = rel_x, rel_y
+            abs_x, abs_y = _to_screen(region, rel_x, rel_y)
 
             self._log(f"Found pop-up, clicking close button at ({abs_x}, {abs_y})")
-            pyautogui.click(abs_x, abs_y)
+            pyautogui.click(abs_x, abs_y, _pause=False)
             time.sleep(0.5)
             return True
 
@@ -243,11 +438,7 @@ class AutoBuyer:
 
             if close_btn:
                 rel_x, rel_y = close_btn
-                if region:
-                    abs_x = rel_x + region[0]
-                    abs_y = rel_y + region[1]
-                else:
-                    abs_x, abs_y = rel_x, rel_y
+                abs_x, abs_y = _to_screen(region, rel_x, rel_y)
 
                 self._log(f"Found popup X at rel=({rel_x}, {rel_y}) abs=({abs_x}, {abs_y}) - dismissing")
                 _move_to(abs_x, abs_y)
@@ -280,22 +471,25 @@ class AutoBuyer:
         if region:
             center_x = region[0] + region[2] // 2
             center_y = region[1] + region[3] // 2
-            pyautogui.click(center_x, center_y)
+            pyautogui.click(center_x, center_y, _pause=False)
             self._log(f"Clicked center ({center_x}, {center_y}) to focus game")
             time.sleep(0.5)
 
         # Dismiss any popups before opening shop
         self._dismiss_all_popups(region)
+        self._log(f"Capture backend: {self.screen.last_backend}")
 
         # Step 1: Teleport to shop using Shift+1
+        before = self.screen.frame_hash(self.screen.capture_screen_gray(region))
         _hotkey('shift', '1')
         self._log("Pressed Shift+1 to teleport to shop")
-        time.sleep(1.0)  # Wait for teleport
+        self.screen.wait_for_transition(region, before, timeout=1.0)  # Wait for teleport
 
         # Step 2: Press space to open Seed Shop panel
+        before = self.screen.frame_hash(self.screen.capture_screen_gray(region))
         _press_key('space')
         self._log("Pressed space to open Seed Shop")
-        time.sleep(1.5)  # Wait for shop to open
+        self.screen.wait_for_transition(region, before, timeout=1.5)  # Wait for shop to open
 
         # Step 3: Buy seeds if enabled
         if shop_mode in ("seed", "both"):
@@ -306,19 +500,22 @@ class AutoBuyer:
         if shop_mode in ("egg", "both"):
             # Scroll up to find "Open Egg Shop" button
             max_scroll_attempts = 10
-            for _ in range(max_scroll_attempts):
-                screen = self.screen.capture_screen(region)
-                if self.screen.find_template(screen, "open_egg_shop"):
+            found = None
+            for attempt in range(max_scroll_attempts + 1):
+                screen = self.screen.capture_screen_gray(region)
+                found = self.screen.find_template(screen, "open_egg_shop", roi=self._roi("open_egg_shop", screen))
+                if found or attempt == max_scroll_attempts:
                     break
                 _press_key('up')
                 time.sleep(click_delay * 2)
 
-            # Open Egg Shop and buy eggs
-            screen = self.screen.capture_screen(region)
-            if self.screen.find_template(screen, "open_egg_shop"):
+            # Open Egg Shop and buy eggs (the frame the button was found on is
+            # the current one - no need to capture and match it again)
+            if found:
+                before = self.screen.frame_hash(screen)
                 _press_key('space')
                 self._log("Pressed space to open Egg Shop")
-                time.sleep(1.5)  # Wait for shop to open
+                self.screen.wait_for_transition(region, before, timeout=1.5)  # Wait for shop to open
                 self._buy_all_items_in_shop_with_scroll(region, shop_type="egg")
 
         self._log("=== Shop cycle complete, restarting... ===")
@@ -330,9 +527,7 @@ class AutoBuyer:
 
         if pos:
             x, y = pos
-            if region:
-                x += region[0]
-                y += region[1]
+            x, y = _to_screen(region, x, y)
             pyautogui.click(x, y)
             self._log(f"Clicked '{text}' at ({x}, {y})")
             return True
@@ -378,6 +573,9 @@ class AutoBuyer:
         self._log(f"Looking for {shop_type} items: {targets}")
         self._log(f"Will scroll until '{end_marker}' is visible (max {max_scroll_pages} pages)")
 
+        # Copy of the previous page, to find how far each scroll moved
+        previous_page = None
+
         # Scroll through the shop and buy items on each page
         for page in range(max_scroll_pages):
             if not self.running or self.paused:
@@ -388,14 +586,26 @@ class AutoBuyer:
             # Keep scanning this page until no more items with stock are found
             # This handles layout shifts after buying items
             items_bought_on_page = True
+            first_scan = True
             while items_bought_on_page:
                 items_bought_on_page = False
 
                 # Scan current page for items (re-scan each loop to get fresh positions)
                 screen = self.screen.capture_screen(region)
 
+                # Everything that was already on the previous page is sold out, so the
+                # first scan after a scroll only needs the newly revealed rows (plus
+                # a margin for a row that was cut off at the bottom)
+                scan_top = 0
+                if first_scan and previous_page is not None:
+                    offset = self.screen.find_scroll_offset(previous_page, screen)
+                    if offset is not None:
+                        scan_top = max(0, screen.shape[0] - offset - 80)
+                        self._log(f"Scrolled {offset}px - scanning rows {scan_top}+ only")
+                first_scan = False
+
                 # Find items with STOCK on the same line (single OCR pass - fast!)
-                shop_items = self.screen.find_shop_items_with_stock(screen, targets, debug=True)
+                shop_items = self._scan_shop_items(screen, targets, top=scan_top)
 
                 if shop_items:
                     self._log(f"Found {len(shop_items)} items on page {page + 1}")
@@ -413,8 +623,13 @@ class AutoBuyer:
                     # Small delay to let UI settle after purchase
                     time.sleep(0.3)
 
-            # After buying all items on this page, capture screen for end marker check
-            screen = self.screen.capture_screen(region)
+            # After buying all items on this page, capture screen for end marker
+            # check - OCR and find_scroll_offset() only need grayscale
+            screen = self.screen.capture_screen_gray(region)
+            # Run that OCR on a worker while the mouse moves into scroll position
+            # (nothing captures again until the result is read, so the frame stays valid)
+            end_check = self._ocr_pool.submit(self.screen.text_exists, screen, end_marker)
+            previous_page = screen.copy()  # The capture buffer is reused
 
             # Scroll down to see more items (use mouse scroll, not arrow keys)
             if region:
@@ -426,13 +641,13 @@ class AutoBuyer:
             else:
                 self._log("WARNING: No region set, cannot center mouse for scroll")
             # Check if we've reached the end of the shop (end marker visible)
-            if self.screen.text_exists(screen, end_marker):
+            if end_check.result():
                 self._log(f"Found '{end_marker}' - scrolling down to fully reveal it")
 
                 # Scroll down a few more times to ensure end marker item is fully visible
                 scroll_amount = -100 if IS_WINDOWS else -10
                 for _ in range(3):
-                    pyautogui.scroll(scroll_amount)
+                    pyautogui.scroll(scroll_amount, _pause=False)
                     time.sleep(0.1)
 
                 self._log("Doing final scan for end marker item...")
@@ -443,7 +658,7 @@ class AutoBuyer:
                 while found_end_item:
                     found_end_item = False
                     screen = self.screen.capture_screen(region)
-                    shop_items = self.screen.find_shop_items_with_stock(screen, targets, debug=True)
+                    shop_items = self._scan_shop_items(screen, targets)
 
                     for target, rel_x, rel_y in shop_items:
                         self._log(f"Found {target} with stock on final page! Buying...")
@@ -467,6 +682,27 @@ class AutoBuyer:
             if popups_dismissed == 0:
                 self._log("No close button found - may need to check region or game state")
 
+    def _scan_shop_items(self, screen, targets: List[str], top: int = 0) -> List[Tuple[str, int, int]]:
+        """Find shop items with stock.
+
+        Only rows from `top` down are searched; positions are still relative
+        to the full frame. An unchanged page costs little: the OCR and
+        template results underneath are cached by exact pixel checksum.
+        """
+        # Item/stock templates are far cheaper than OCR; fall back to OCR when
+        # they aren't set up or find nothing (OCR also covers untemplated targets)
+        view = screen[top:] if top else screen
+        if self.screen.page_is_empty(view, self.config.get("empty_page_threshold", 1.5)):
+            self._log("Page is blank (still loading?) - skipping scan")
+            shop_items = []
+        else:
+            shop_items = self.screen.find_shop_items_by_template(view, targets, debug=True)
+            if not shop_items:
+                shop_items = self.screen.find_shop_items_with_stock(view, targets, debug=True)
+        if top:
+            shop_items = [(target, x, y + top) for target, x, y in shop_items]
+        return shop_items
+
     def _buy_until_no_stock(self, target: str, region: Optional[Tuple[int, int, int, int]]):
         """Keep buying a specific item until NO STOCK appears (OCR version)."""
         click_delay = self.config.get("click_delay", 0.1)
@@ -490,13 +726,10 @@ class AutoBuyer:
 
             rel_x, rel_y = pos
             # Add region offset to convert from image coords to screen coords
-            if region:
-                abs_x = rel_x + region[0]
-                abs_y = rel_y + region[1]
-            else:
-                abs_x, abs_y = rel_x, rel_y
+            abs_x, abs_y = _to_screen(region, rel_x, rel_y)
 
-            self._log(f"Clicking {target}: relative=({rel_x},{rel_y}) + region offset=({region[0] if region else 0},{region[1] if region else 0}) = absolute=({abs_x},{abs_y})")
+            self._log("Clicking %s: relative=(%d,%d) + region offset=(%d,%d) = absolute=(%d,%d)",
+                      target, rel_x, rel_y, abs_x - rel_x, abs_y - rel_y, abs_x, abs_y)
 
             # Click item to expand accordion
             pyautogui.click(abs_x, abs_y)
@@ -522,12 +755,9 @@ class AutoBuyer:
             buy_match = self.screen.find_template(screen, "buy_button")
             if buy_match:
                 buy_rel_x, buy_rel_y, conf = buy_match
-                if region:
-                    buy_abs_x = buy_rel_x + region[0]
-                    buy_abs_y = buy_rel_y + region[1]
-                else:
-                    buy_abs_x, buy_abs_y = buy_rel_x, buy_rel_y
-                self._log(f"Found buy button: relative=({buy_rel_x},{buy_rel_y}) conf={conf:.2f} -> absolute=({buy_abs_x},{buy_abs_y})")
+                buy_abs_x, buy_abs_y = _to_screen(region, buy_rel_x, buy_rel_y)
+                self._log("Found buy button: relative=(%d,%d) conf=%.2f -> absolute=(%d,%d)",
+                          buy_rel_x, buy_rel_y, conf, buy_abs_x, buy_abs_y)
                 pyautogui.click(buy_abs_x, buy_abs_y)
                 self.items_purchased += 1
                 self._log(f"Purchased {target}!")
@@ -556,37 +786,55 @@ class AutoBuyer:
                 self._log(f"Could not find {target}")
                 return
             rel_x, rel_y = pos
-        if region:
-            abs_x = rel_x + region[0]
-            abs_y = rel_y + region[1]
-        else:
-            abs_x, abs_y = rel_x, rel_y
+        abs_x, abs_y = _to_screen(region, rel_x, rel_y)
 
         self._log(f"Clicking {target}: ({rel_x},{rel_y}) -> ({abs_x},{abs_y})")
-        pyautogui.click(abs_x, abs_y)
+        pyautogui.click(abs_x, abs_y, _pause=False)
         self.items_detected += 1
         self.last_detection_time = time.time()
 
         if self.on_detection:
             self.on_detection(target, (abs_x, abs_y))
 
-        # Wait for accordion to fully open before capturing screenshot
+        # The accordion opens below the item, so skip the rows above it and
+        # anything well past the donut-button cutoff (the box is open-ended
+        # downwards - crop_roi clamps it to the frame)
+        max_x_offset_right = 200  # pixels to the right of item center
+        button_roi = (0, rel_y - 60, rel_x + max_x_offset_right * 2, rel_y + 100000)
+
+        # Wait for accordion to fully open before capturing screenshot - only
+        # the area it opens into is watched, so its motion isn't averaged away
         self._log("Waiting for accordion to open...")
-        time.sleep(1.0)
+        self.screen.wait_for_stable(region, timeout=1.0, roi=button_roi)
 
         # NOW capture screenshot with accordion open
         self._log("Capturing screenshot for buy button detection...")
         screen = self.screen.capture_screen(region)
-        green_buttons = self.screen.find_green_buttons(screen, debug=True)
 
         buy_rel_x, buy_rel_y = None, None
 
+        # Look for the button where the last item's was first - a box around
+        # it is far cheaper to threshold than everything below the item. The
+        # box is wide enough for a full-width button, and a hit must sit right
+        # on the guess so a button clipped by the box edge isn't taken
+        if self._buy_offset:
+            guess_x, guess_y = rel_x + self._buy_offset[0], rel_y + self._buy_offset[1]
+            near = self.screen.find_green_buttons(screen, roi=(guess_x - 250, guess_y - 60, guess_x + 250, guess_y + 60))
+            near = [(bx, by) for bx, by in near
+                    if abs(bx - guess_x) <= 20 and abs(by - guess_y) <= 20 and bx - rel_x < max_x_offset_right]
+            if near:
+                buy_rel_x, buy_rel_y = min(near, key=lambda b: b[0])
+                self._log(f"Green button at ({buy_rel_x},{buy_rel_y}), where the last one was")
+
+        green_buttons = None
+        if buy_rel_x is None:
+            green_buttons = self.screen.find_green_buttons(screen, debug=True, roi=button_roi)
+
         if green_buttons:
             self._log(f"Found {len(green_buttons)} green button(s): {green_buttons}")
 
             # Filter out buttons that are too far RIGHT of the item (likely donut button)
             # The regular buy button should be roughly aligned with or left of the item
-            max_x_offset_right = 200  # pixels to the right of item center
             valid_buttons = [(bx, by) for bx, by in green_buttons if bx - rel_x < max_x_offset_right]
 
             if valid_buttons:
@@ -601,8 +849,10 @@ class AutoBuyer:
         # Fallback to template matching if color detection failed
         if buy_rel_x is None:
             self._log("Color detection failed, trying template matching...")
-            for template_name in ["green_buy_button", "buy_button"]:
-                buy_match = self.screen.find_template(screen, template_name)
+            template_names = ["green_buy_button", "buy_button"]
+            matches = self.screen.find_templates(screen, template_names)
+            for template_name in template_names:
+                buy_match = matches.get(template_name)
                 if buy_match:
                     tmpl_x, tmpl_y, conf = buy_match
                     x_offset = abs(tmpl_x - rel_x)
@@ -618,40 +868,47 @@ class AutoBuyer:
         if buy_rel_x is None:
             self._log(f"{target}: No buy button found")
             return
+        self._buy_offset = (buy_rel_x - rel_x, buy_rel_y - rel_y)
 
         # Calculate absolute position once
-        if region:
-            buy_abs_x = buy_rel_x + region[0]
-            buy_abs_y = buy_rel_y + region[1]
-        else:
-            buy_abs_x, buy_abs_y = buy_rel_x, buy_rel_y
+        buy_abs_x, buy_abs_y = _to_screen(region, buy_rel_x, buy_rel_y)
 
-        self._log(f"Buy button at ({buy_abs_x},{buy_abs_y}) - clicking until grey")
+        self._log("Buy button at (%d,%d) - clicking until grey", buy_abs_x, buy_abs_y)
 
         # Move cursor to buy button once, then keep clicking until it turns grey
         pyautogui.moveTo(buy_abs_x, buy_abs_y)
         bought_count = 0
 
+        # Only the area around the buy button matters for the sold-out check
+        check_roi = (buy_rel_x - 150, buy_rel_y - 150, buy_rel_x + 150, buy_rel_y + 150)
+
+        # Bound methods used on every click, looked up once
+        click = _click_here
+        capture_screen = self.screen.capture_screen
+        find_green_buttons = self.screen.find_green_buttons
+        on_purchase = self.on_purchase
+
         # Keep clicking until the button is no longer green (grey = sold out)
         while True:
             if not self.running or self.paused:
                 return
 
-            # Click at current cursor position
-            pyautogui.click()
+            # Click at current cursor position (the click_delay sleep below is
+            # the only wait - no extra pyautogui.PAUSE on top of it)
+            click()
             bought_count += 1
             self.items_purchased += 1
 
-            if self.on_purchase:
-                self.on_purchase(target)
+            if on_purchase:
+                on_purchase(target)
 
             time.sleep(click_delay)
 
             # Check if button is still green
-            screen = self.screen.capture_screen(region)
+            screen = capture_screen(region)
             # Enable debug every 10 clicks to see what's being detected
             debug_this_check = (bought_count % 10 == 0)
-            green_buttons = self.screen.find_green_buttons(screen, debug=debug_this_check)
+            green_buttons = find_green_buttons(screen, debug=debug_this_check, roi=check_roi)
 
             if green_buttons:
                 # Verify the detected button is near where we're clicking
@@ -665,8 +922,8 @@ class AutoBuyer:
             else:
                 # Button not found - quick retry in case of animation
                 time.sleep(0.1)
-                screen = self.screen.capture_screen(region)
-                green_buttons = self.screen.find_green_buttons(screen, debug=False)
+                screen = capture_screen(region)
+                green_buttons = find_green_buttons(screen, debug=False, roi=check_roi)
 
                 if not green_buttons:
                     self._log(f"Purchased {target}! (x{bought_count}) - sold out")
@@ -695,13 +952,9 @@ class AutoBuyer:
 
             rel_x, rel_y, conf = match
             # Add region offset to convert from image coords to screen coords
-            if region:
-                abs_x = rel_x + region[0]
-                abs_y = rel_y + region[1]
-            else:
-                abs_x, abs_y = rel_x, rel_y
+            abs_x, abs_y = _to_screen(region, rel_x, rel_y)
 
-            self._log(f"Clicking {template_name}: relative=({rel_x},{rel_y}) conf={conf:.2f} -> absolute=({abs_x},{abs_y})")
+            self._log("Clicking %s: relative=(%d,%d) conf=%.2f -> absolute=(%d,%d)", template_name, rel_x, rel_y, conf, abs_x, abs_y)
 
             # Click item to expand accordion
             pyautogui.click(abs_x, abs_y)
@@ -726,12 +979,9 @@ class AutoBuyer:
             buy_match = self.screen.find_template(screen, "buy_button")
             if buy_match:
                 buy_rel_x, buy_rel_y, buy_conf = buy_match
-                if region:
-                    buy_abs_x = buy_rel_x + region[0]
-                    buy_abs_y = buy_rel_y + region[1]
-                else:
-                    buy_abs_x, buy_abs_y = buy_rel_x, buy_rel_y
-                self._log(f"Found buy button: relative=({buy_rel_x},{buy_rel_y}) conf={buy_conf:.2f} -> absolute=({buy_abs_x},{buy_abs_y})")
+                buy_abs_x, buy_abs_y = _to_screen(region, buy_rel_x, buy_rel_y)
+                self._log("Found buy button: relative=(%d,%d) conf=%.2f -> absolute=(%d,%d)",
+                          buy_rel_x, buy_rel_y, buy_conf, buy_abs_x, buy_abs_y)
                 pyautogui.click(buy_abs_x, buy_abs_y)
                 self.items_purchased += 1
                 self._log(f"Purchased {template_name}!")
@@ -766,9 +1016,7 @@ class AutoBuyer:
                 if pos:
                     x, y = pos
                     # Adjust for region offset
-                    if region:
-                        x += region[0]
-                        y += region[1]
+                    x, y = _to_screen(region, x, y)
                     # Convert target name to item_type (e.g., "Mythical Egg" -> "mythical_egg")
                     item_type = target.lower().replace(" ", "_")
                     self._handle_ocr_detection(item_type, (x, y), region)
@@ -799,9 +1047,7 @@ class AutoBuyer:
         x, y, confidence = match
 
         # Adjust coordinates if using a region
-        if region:
-            x += region[0]
-            y += region[1]
+        x, y = _to_screen(region, x, y)
 
         self.items_detected += 1
         self.last_detection_time = time.time()
@@ -820,7 +1066,7 @@ class AutoBuyer:
         click_delay = self.config.get("click_delay", 0.1)
 
         # Click on the item
-        pyautogui.click(x, y)
+        pyautogui.click(x, y, _pause=False)
         time.sleep(click_delay)
 
         # Look for and click buy button
@@ -838,14 +1084,50 @@ class AutoBuyer:
         else:
             self._log(f"Could not find buy button for {item_type}")
 
-    def _log(self, message: str):
-        """Log a message and notify callback."""
-        timestamp = time.strftime("%H:%M:%S")
-        full_message = f"[{timestamp}] {message}"
-        print(full_message)
+    def _log(self, message: str, *args):
+        """Queue a message for logging; dropped if the log thread is far behind.
+
+        With args, message is a %-format string that the log thread fills in,
+        so hot loops don't pay for the formatting.
+        """
+        try:
+            self._log_queue.put_nowait((time.time(), message, args))
+        except queue.Full:
+            pass
 
+    def _drain_log(self):
+        """Log thread: print queued messages and notify the callback."""
+        while True:
+            timestamp, message, args = self._log_queue.get()
+            try:
+                if args:
+                    message = message % args
+                full_message = f"[{time.strftime('%H:%M:%S', time.localtime(timestamp))}] {message}"
+                print(full_message)
+
+                if self.on_status_change:
+                    try:
+                        self.on_status_change(full_message)
+                    except Exception as e:
+                        print(f"Status callback failed: {e}")
+            except Exception:
+                # A bad format string or an unwritable stdout drops this
+                # message instead of killing the log thread
+                pass
+            finally:
+                self._log_queue.task_done()
+
+    def _flush_log(self, timeout: float = 0.5):
+        """Give the log thread a moment to print what's queued (e.g. before exit).
+
+        Headless only: with a GUI callback the log thread may be waiting on the
+        Tk thread that called us, so waiting would just burn the timeout.
+        """
         if self.on_status_change:
-            self.on_status_change(full_message)
+            return
+        deadline = time.monotonic() + timeout
+        while self._log_queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
 
     def get_stats(self) -> dict:
         """Get current statistics."""
@@ -857,15 +1139,40 @@ class AutoBuyer:
             "paused": self.paused
         }
 
-    def _get_active_window_region(self) -> Optional[Tuple[int, int, int, int]]:
-        """Get the region (x, y, width, height) of the frontmost window on macOS."""
+    def _get_active_window_region(self, max_age: float = 1.0) -> Optional[Tuple[int, int, int, int]]:
+        """Get the region (x, y, width, height) of the frontmost window on macOS.
+
+        Listing windows copies every on-screen window's info across the
+        Objective-C bridge, so the result is reused until the frontmost app
+        changes or it is older than max_age seconds (the window may have moved).
+        """
         if not HAS_QUARTZ:
             self._log("Quartz not available - using config region")
             return None
 
+        # Frontmost-app lookup is a single call, far cheaper than listing every
+        # window. AppKit is imported here, not at module load, since importing
+        # it is slow and only this method needs it
+        front_pid = None
         try:
-            # Get list of all on-screen windows
-            window_list = CGWindowListCopyWindowInfo(kCGWindowListOptionOnScreenOnly, kCGNullWindowID)
+            from AppKit import NSWorkspace
+        except ImportError:
+            pass
+        else:
+            app = NSWorkspace.sharedWorkspace().frontmostApplication()
+            front_pid = app.processIdentifier() if app else None
+
+        now = time.monotonic()
+        if self._window_cache is not None:
+            cached_pid, cached_at, cached_region = self._window_cache
+            if cached_pid == front_pid and now - cached_at < max_age:
+                return cached_region
+
+        region = None
+        try:
+            # Get list of on-screen windows (desktop icons/wallpaper excluded)
+            window_list = CGWindowListCopyWindowInfo(
+                kCGWindowListOptionOnScreenOnly | kCGWindowListExcludeDesktopElements, kCGNullWindowID)
 
             for window in window_list:
                 # Layer 0 is typically the frontmost app window
@@ -877,8 +1184,11 @@ class AutoBuyer:
                         w = int(bounds.get('Width', 0))
                         h = int(bounds.get('Height', 0))
                         if w > 100 and h > 100:  # Filter out tiny windows
-                            return (x, y, w, h)
+                            region = (x, y, w, h)
+                            break
         except Exception as e:
             self._log(f"Error getting active window: {e}")
+            return None
 
-        return None
+        self._window_cache = (front_pid, now, region)
+        return region
@@ -1,8 +1,29 @@
+import copy
 import json
 import os
 import platform
 from pathlib import Path
 
+# orjson parses config.json several times faster than stdlib json;
+# its JSONDecodeError subclasses json.JSONDecodeError so error handling is shared
+try:
+    import orjson
+
+    def load_json(path) -> dict:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+except ImportError:
+    def load_json(path) -> dict:
+        with open(path, 'r') as f:
+            return json.load(f)
+
+
+# Writes stay on stdlib json: orjson only indents by 2, which would reformat
+# the 4-space config.json on every save, and saves are rare
+def dump_json(data, path):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
 # Platform-specific monitor regions
 MONITOR_REGIONS = {
     "Darwin": [271, 87, 645, 534],   # macOS
@@ -11,8 +32,15 @@ MONITOR_REGIONS = {
 
 DEFAULT_CONFIG = {
     "scan_interval": 0.5,
+    "max_scan_interval": None,  # None = 4x scan_interval
     "click_delay": 0.1,
     "confidence_threshold": 0.8,
+    "matcher": "pyramid",
+    "use_gpu": False,
+    "use_simd": True,
+    "use_fp16": False,
+    "ocr_downscale": 1.0,
+    "rois": {},
     "monitor_region": MONITOR_REGIONS.get(platform.system()),
     "templates": {
         "mythical_egg": "templates/mythical_egg.png",
@@ -34,26 +62,24 @@ class Config:
     def _load(self) -> dict:
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    loaded = json.load(f)
-                    merged = DEFAULT_CONFIG.copy()
-                    merged.update(loaded)
-                    # Use config.json region if set, otherwise use platform default
-                    if "monitor_region" in loaded and loaded["monitor_region"]:
-                        print(f"Using config.json monitor region: {merged['monitor_region']}")
-                    else:
-                        merged["monitor_region"] = MONITOR_REGIONS.get(platform.system())
-                        print(f"Using {platform.system()} default monitor region: {merged['monitor_region']}")
-                    return merged
+                loaded = load_json(self.config_path)
+                merged = copy.deepcopy(DEFAULT_CONFIG)
+                merged.update(loaded)
+                # Use config.json region if set, otherwise use platform default
+                if "monitor_region" in loaded and loaded["monitor_region"]:
+                    print(f"Using config.json monitor region: {merged['monitor_region']}")
+                else:
+                    merged["monitor_region"] = MONITOR_REGIONS.get(platform.system())
+                    print(f"Using {platform.system()} default monitor region: {merged['monitor_region']}")
+                return merged
             except json.JSONDecodeError:
                 print(f"Warning: Invalid config file, using defaults")
-                return DEFAULT_CONFIG.copy()
+                return copy.deepcopy(DEFAULT_CONFIG)
         print(f"Using {platform.system()} default monitor region: {DEFAULT_CONFIG['monitor_region']}")
-        return DEFAULT_CONFIG.copy()
+        return copy.deepcopy(DEFAULT_CONFIG)
 
     def save(self):
-        with open(self.config_path, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        dump_json(self.data, self.config_path)
 
     def get(self, key: str, default=None):
         return self.data.get(key, default)
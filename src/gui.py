@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
+from collections import deque
 from typing import Optional
 from pynput import keyboard
 from .auto_buyer import AutoBuyer
@@ -18,6 +19,10 @@ class BotGUI:
         self.log_text: Optional[tk.Text] = None
         self.stats_labels = {}
 
+        # Messages from the bot thread, inserted into log_text in batches
+        self._pending_logs = deque()
+        self._log_flush_scheduled = False
+
     def run(self):
         """Start the GUI."""
         self.root = tk.Tk()
@@ -157,7 +162,10 @@ class BotGUI:
             self._log(f"Got bottom-right: ({x2}, {y2})")
 
             # Calculate region (x, y, width, height)
-            region = [min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1)]
+            dx, dy = x2 - x1, y2 - y1
+            left, width = (x1, dx) if dx >= 0 else (x2, -dx)
+            top, height = (y1, dy) if dy >= 0 else (y2, -dy)
+            region = [left, top, width, height]
             self._log(f"Region set: {region}")
 
             # Save to config
@@ -167,8 +175,28 @@ class BotGUI:
         threading.Thread(target=capture_region, daemon=True).start()
 
     def _on_log_message(self, message: str):
-        """Handle log message callback."""
-        self.root.after(0, lambda: self._log(message))
+        """Handle log message callback (bot thread) - queue it for the next batched insert."""
+        self._pending_logs.append(message)
+        if not self._log_flush_scheduled:
+            # Set before scheduling so the flush can't run first and be
+            # shadowed, but undo it if Tk rejects the after() call - otherwise
+            # no flush would ever be scheduled again
+            self._log_flush_scheduled = True
+            try:
+                self.root.after(33, self._flush_logs)
+            except Exception:
+                self._log_flush_scheduled = False
+                raise
+
+    def _flush_logs(self):
+        """Insert every queued message with one widget update (at most ~30 per second)."""
+        # Clear the flag before draining, so a message queued mid-drain schedules a new flush
+        self._log_flush_scheduled = False
+        messages = []
+        while self._pending_logs:
+            messages.append(self._pending_logs.popleft())
+        if messages:
+            self._log("\n".join(messages))
 
     def _on_item_detected(self, item_type: str, position: tuple):
         """Handle item detection callback."""
@@ -2,13 +2,43 @@ import cv2
 import numpy as np
 import pyautogui
 import pytesseract
+import contextlib
+import json
 import warnings
 import sys
 import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, List
 from PIL import Image
 
+# mss grabs straight from XShm/Quartz/BitBlt - much faster than pyautogui
+try:
+    import mss
+    HAS_MSS = True
+except ImportError:
+    HAS_MSS = False
+
+# rapidfuzz scores OCR misreads ("sunflowcr") against item names in C
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# dxcam streams frames via DXGI Desktop Duplication on Windows (no GDI BitBlt)
+HAS_DXCAM = False
+if sys.platform == "win32":
+    try:
+        import dxcam
+        HAS_DXCAM = True
+    except ImportError:
+        pass
+
 # Suppress torch warnings
 warnings.filterwarnings("ignore", message=".*pin_memory.*")
 
@@ -25,29 +55,208 @@ def get_resource_path(relative_path: str) -> Path:
     return base_path / relative_path
 
 
+def _mss_monitor(sct, region: Optional[Tuple[int, int, int, int]]) -> dict:
+    """Convert an (x, y, width, height) region to an mss monitor dict."""
+    if not region:
+        # The primary monitor, like pyautogui.screenshot() - frame coordinates
+        # are used as screen coordinates, so they must start at its origin
+        return sct.monitors[1]
+    x, y, w, h = region
+    return {"left": int(x), "top": int(y), "width": int(w), "height": int(h)}
+
+
+def _grab_bgra(sct, region: Optional[Tuple[int, int, int, int]], scaled_buf: Optional[np.ndarray] = None) -> np.ndarray:
+    """Grab a region with mss as an HxWx4 BGRA array sized in screen points.
+
+    scaled_buf, if it has the right shape, receives the HiDPI downscale
+    instead of a newly allocated array.
+    """
+    monitor = _mss_monitor(sct, region)
+    raw = sct.grab(monitor)
+    bgra = np.frombuffer(raw.bgra, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+    if (raw.width, raw.height) != (monitor["width"], monitor["height"]):
+        # HiDPI (Retina) grabs come back at device-pixel scale; click math
+        # assumes one frame pixel per screen point
+        size = (monitor["width"], monitor["height"])
+        if scaled_buf is not None and scaled_buf.shape == (size[1], size[0], 4):
+            bgra = cv2.resize(bgra, size, dst=scaled_buf, interpolation=cv2.INTER_AREA)
+        else:
+            bgra = cv2.resize(bgra, size, interpolation=cv2.INTER_AREA)
+    return bgra
+
+
+def grab_image(region: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+    """Grab the screen (or an (x, y, width, height) region) as an RGB PIL image."""
+    if not HAS_MSS:
+        return pyautogui.screenshot(region=region)
+
+    with mss.mss() as sct:
+        rgb = cv2.cvtColor(_grab_bgra(sct, region), cv2.COLOR_BGRA2RGB)
+    return Image.fromarray(rgb)
+
+
+def crop_roi(screen: np.ndarray, roi: Optional[Tuple[int, int, int, int]]) -> Tuple[Optional[np.ndarray], int, int]:
+    """Slice an (x0, y0, x1, y1) box out of a frame, clamped to its bounds.
+
+    Returns:
+        (view, x0, y0) - the view is None if the box is empty. With no roi
+        the whole frame is returned at offset (0, 0).
+    """
+    if not roi:
+        return screen, 0, 0
+    screen_h, screen_w = screen.shape[:2]
+    x0, y0 = max(int(roi[0]), 0), max(int(roi[1]), 0)
+    x1, y1 = min(int(roi[2]), screen_w), min(int(roi[3]), screen_h)
+    if x1 <= x0 or y1 <= y0:
+        return None, x0, y0
+    return screen[y0:y1, x0:x1], x0, y0  # View, no copy
+
+
+def build_template_pyramid(gray: np.ndarray, min_size: int = 16) -> List[np.ndarray]:
+    """Build a Gaussian pyramid (full resolution first) of a grayscale template."""
+    pyramid = [gray]
+    while min(pyramid[-1].shape[:2]) > min_size:
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def save_template_cache(path: str, image: Image.Image):
+    """Save a template's grayscale pixels as a raw .bin (plus .json shape sidecar).
+
+    load_template() memory-maps the .bin instead of decoding the PNG while
+    it is at least as new as the PNG. The coarser pyramid levels are cheap
+    to rebuild from it, so only the full-resolution level is stored.
+    """
+    gray = np.ascontiguousarray(cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2GRAY))
+    base = Path(path)
+    gray.tofile(base.with_suffix(".bin"))
+    with open(base.with_suffix(".json"), "w") as f:
+        json.dump({"shape": list(gray.shape)}, f)
+
+
 # Lazy load easyocr (it's slow to import)
 _easyocr_reader = None
+_easyocr_device = "cpu"
 
 def get_easyocr_reader():
-    global _easyocr_reader
+    global _easyocr_reader, _easyocr_device
     if _easyocr_reader is None:
+        # Let ops MPS doesn't implement fall back to CPU instead of raising
+        os.environ.setdefault("PYTORCH_ENABLE_MPS_FALLBACK", "1")
         import easyocr
         import torch
 
-        # Check if MPS (M1/M2 GPU) is available
-        use_gpu = torch.backends.mps.is_available()
-        if use_gpu:
-            print("[EasyOCR] Using M1/M2 GPU (MPS)")
+        # Prefer a CUDA GPU, then M1/M2 GPU (MPS), then CPU
+        if torch.cuda.is_available():
+            _easyocr_device = "cuda"
+        elif torch.backends.mps.is_available():
+            _easyocr_device = "mps"
         else:
-            print("[EasyOCR] Using CPU")
-
-        _easyocr_reader = easyocr.Reader(['en'], gpu=use_gpu, verbose=False)
+            _easyocr_device = "cpu"
+
+        try:
+            _easyocr_reader = easyocr.Reader(['en'], gpu=_easyocr_device != "cpu", verbose=False)
+        except Exception as e:
+            print(f"[EasyOCR] Could not start on {_easyocr_device} ({e}), falling back to CPU")
+            _easyocr_device = "cpu"
+            _easyocr_reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        print(f"[EasyOCR] Using {_easyocr_device.upper()}")
     return _easyocr_reader
 
+def easyocr_precision(use_fp16: bool):
+    """Context manager for an easyocr call: fp16 autocast on GPU, no-op otherwise.
+
+    Autocast runs the detector/recognizer convolutions in half precision
+    without casting the models, so easyocr's fp32 inputs still work.
+    """
+    if not use_fp16 or _easyocr_device == "cpu":
+        return contextlib.nullcontext()
+    import torch
+    try:
+        return torch.autocast(device_type=_easyocr_device, dtype=torch.float16)
+    except RuntimeError:
+        # Older torch builds have no autocast for this device
+        return contextlib.nullcontext()
+
+def cuda_available() -> bool:
+    """True if this OpenCV build has CUDA support and a CUDA device is present."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+# Strategies for find_template: "spatial" (plain matchTemplate), "fft"
+# (frequency-domain correlation) or "pyramid" (coarse-to-fine search)
+MATCHERS = ("spatial", "fft", "pyramid")
+
+# Pyramid search tolerances: coarse candidates are kept this far below the
+# threshold (detail is lost when downsampling), and a refined best score this
+# close under it is rechecked with a full-resolution match
+PYRAMID_COARSE_MARGIN = 0.15
+PYRAMID_RECHECK_MARGIN = 0.02
+
+
 class ScreenCapture:
-    def __init__(self, confidence_threshold: float = 0.8):
+    def __init__(self, confidence_threshold: float = 0.8, matcher: str = "pyramid", use_gpu: bool = False,
+                 use_simd: bool = True, workers: Optional[int] = None, use_fp16: bool = False,
+                 ocr_scale: float = 1.0):
         self.confidence = confidence_threshold
-        self.templates = {}
+        self.use_fp16 = use_fp16  # Half-precision easyocr on CUDA/MPS
+        self.ocr_scale = ocr_scale  # Frames are resized by this before tesseract (<1 = fewer pixels)
+
+        # Capture backends: a dxcam stream for the game region (Windows) or a
+        # per-thread mss grabber writing into a reused frame buffer
+        self._camera = None
+        self._camera_region: Optional[Tuple[int, int, int, int]] = None
+        self._local = threading.local()
+        self._frame_buf: Optional[np.ndarray] = None
+        self._gray_buf: Optional[np.ndarray] = None
+        self.last_backend: Optional[str] = None
+
+        # Worker pool for matching several templates per frame (created on first use)
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        # OpenCV's SIMD/IPP kernels (used by matchTemplate, cvtColor, inRange) are
+        # process-wide and can be switched off by some builds or host apps
+        cv2.setUseOptimized(use_simd)
+        if use_simd and not cv2.useOptimized():
+            print("Warning: OpenCV optimized (SIMD/IPP) code paths are unavailable in this build")
+
+        # Grayscale (and, for the fft matcher, integral images) of the last
+        # frame as (screen, gray, integrals) - every lookup on one frame shares them
+        self._frame_cache: Optional[tuple] = None
+
+        # Detection results (OCR data, template matches) for recently seen
+        # frames, keyed by a pixel checksum - a static screen or repeated
+        # lookups on one frame skip tesseract/matchTemplate entirely
+        self._results: OrderedDict = OrderedDict()
+        self._results_lock = threading.Lock()
+        self.result_cache_size = 32
+        self._key_cache: Optional[tuple] = None  # (screen, checksum key) of the last frame
+
+        self.matcher = matcher if matcher in MATCHERS else "pyramid"
+        self.templates = {}  # Grayscale templates (matching is done in grayscale)
+        self.template_pyramids = {}
+        # (name, screen shape) -> (conjugate template spectrum, template norm) for the fft matcher
+        self._tmpl_fft = {}
+
+        # Optional CUDA matching - templates stay resident on the device. Without
+        # CUDA, OpenCV's T-API (UMat) runs matchTemplate through OpenCL instead
+        self._gpu_matcher = None
+        self._gpu_templates = {}
+        self._ocl_templates = None  # name -> cv2.UMat when matching via OpenCL
+        if use_gpu:
+            if cuda_available():
+                self._gpu_matcher = cv2.cuda.createTemplateMatching(cv2.CV_8U, cv2.TM_CCOEFF_NORMED)
+                print("[ScreenCapture] Using CUDA template matching")
+            elif cv2.ocl.haveOpenCL():
+                cv2.ocl.setUseOpenCL(True)
+                self._ocl_templates = {}
+                print("[ScreenCapture] Using OpenCL template matching")
+            else:
+                print("Warning: GPU matching requested but no CUDA or OpenCL device found - using CPU")
 
     def load_template(self, name: str, path: str) -> bool:
         """Load a template image for matching."""
@@ -61,12 +270,40 @@ class ScreenCapture:
             print(f"Warning: Template not found: {path} (also tried {template_path})")
             return False
 
-        template = cv2.imread(str(template_path), cv2.IMREAD_COLOR)
-        if template is None:
-            print(f"Warning: Could not load template: {template_path}")
-            return False
-
-        self.templates[name] = template
+        # Prefer the raw grayscale cache unless the PNG was replaced since
+        cache_path = template_path.with_suffix(".bin")
+        meta_path = template_path.with_suffix(".json")
+        gray = None
+        if (cache_path.exists() and meta_path.exists()
+                and cache_path.stat().st_mtime >= template_path.stat().st_mtime):
+            # A damaged cache (truncated .bin, bad sidecar) falls back to the PNG
+            try:
+                with open(meta_path, "r") as f:
+                    shape = tuple(int(n) for n in json.load(f)["shape"])
+                if len(shape) != 2 or cache_path.stat().st_size != shape[0] * shape[1]:
+                    raise ValueError(f"cache size doesn't match shape {shape}")
+                gray = np.memmap(cache_path, dtype=np.uint8, mode="r", shape=shape)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Warning: Ignoring template cache {cache_path}: {e}")
+        if gray is None:
+            template = cv2.imread(str(template_path), cv2.IMREAD_COLOR)
+            if template is None:
+                print(f"Warning: Could not load template: {template_path}")
+                return False
+            gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        pyramid = build_template_pyramid(gray)
+
+        self.templates[name] = pyramid[0]
+        self.template_pyramids[name] = pyramid
+        self._tmpl_fft = {key: value for key, value in self._tmpl_fft.items() if key[0] != name}
+        with self._results_lock:
+            self._results.clear()
+        if self._gpu_matcher is not None:
+            gpu_template = cv2.cuda_GpuMat()
+            gpu_template.upload(pyramid[0])
+            self._gpu_templates[name] = gpu_template
+        if self._ocl_templates is not None:
+            self._ocl_templates[name] = cv2.UMat(np.ascontiguousarray(pyramid[0]))
         return True
 
     def capture_screen(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
@@ -76,15 +313,151 @@ class ScreenCapture:
             region: Optional (x, y, width, height) tuple
 
         Returns:
-            Screenshot as numpy array in BGR format
+            Screenshot as numpy array in BGR format. The array is a read-only
+            view of a reused buffer, so it is only valid until the next
+            capture_screen() call - copy it to keep or draw on it.
+        """
+        if self._camera_region is not None and region is not None and tuple(region) == self._camera_region:
+            self.last_backend = "dxcam"
+            return self._camera.get_latest_frame()
+
+        if HAS_MSS:
+            bgra = self._grab_mss(region)
+            frame = cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._frame_buffer(bgra.shape[:2]))
+        else:
+            self.last_backend = "pyautogui"
+            screenshot = pyautogui.screenshot(region=region)
+            # Swap channels (and drop alpha, if any) in the same cvtColor pass
+            # instead of a PIL convert("RGB") copy first
+            if screenshot.mode == "RGBA":
+                code = cv2.COLOR_RGBA2BGR
+            else:
+                screenshot = screenshot.convert("RGB") if screenshot.mode != "RGB" else screenshot
+                code = cv2.COLOR_RGB2BGR
+            pixels = np.asarray(screenshot)
+            frame = cv2.cvtColor(pixels, code, dst=self._frame_buffer(pixels.shape[:2]))
+
+        view = frame.view()
+        view.flags.writeable = False
+        return view
+
+    def capture_screen_gray(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """Capture straight to grayscale, for lookups that never look at color.
+
+        Template matching, OCR and frame_hash() all work on grayscale, so
+        this skips the BGR frame and its later gray conversion - one pass over
+        a third of the bytes. Like capture_screen(), the result is a read-only
+        view of a reused buffer (separate from the color one).
+        """
+        camera_hit = self._camera_region is not None and region is not None and tuple(region) == self._camera_region
+        if camera_hit:
+            gray = cv2.cvtColor(self.capture_screen(region), cv2.COLOR_BGR2GRAY)
+        elif HAS_MSS:
+            bgra = self._grab_mss(region)
+            gray = cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY, dst=self._gray_buffer(bgra.shape[:2]))
+        else:
+            # Straight from pyautogui's RGB(A) to gray - no intermediate BGR frame
+            self.last_backend = "pyautogui"
+            screenshot = pyautogui.screenshot(region=region)
+            if screenshot.mode not in ("RGB", "RGBA"):
+                screenshot = screenshot.convert("RGB")
+            pixels = np.asarray(screenshot)
+            code = cv2.COLOR_RGBA2GRAY if screenshot.mode == "RGBA" else cv2.COLOR_RGB2GRAY
+            gray = cv2.cvtColor(pixels, code, dst=self._gray_buffer(pixels.shape[:2]))
+
+        view = gray.view()
+        view.flags.writeable = False
+        return view
+
+    def _grab_mss(self, region: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
+        """Grab a BGRA frame with this thread's mss handle."""
+        self.last_backend = "mss"
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            # mss handles are not safe to share between threads
+            sct = self._local.sct = mss.mss()
+        bgra = _grab_bgra(sct, region, getattr(self._local, "scaled_buf", None))
+        if bgra.base is None:
+            self._local.scaled_buf = bgra  # A HiDPI resize - reuse it next time
+        return bgra
+
+    def _gray_buffer(self, shape: Tuple[int, int]) -> np.ndarray:
+        """The shared HxW gray capture buffer, reallocated only when the size changes."""
+        if self._gray_buf is None or self._gray_buf.shape != shape:
+            self._gray_buf = np.empty(shape, dtype=np.uint8)
+        return self._gray_buf
+
+    def _frame_buffer(self, shape: Tuple[int, int]) -> np.ndarray:
+        """The shared HxWx3 capture buffer, reallocated only when the size changes."""
+        if self._frame_buf is None or self._frame_buf.shape[:2] != shape:
+            self._frame_buf = np.empty((shape[0], shape[1], 3), dtype=np.uint8)
+        return self._frame_buf
+
+    def start_stream(self, region: Optional[Tuple[int, int, int, int]], target_fps: int = 30):
+        """Start a persistent dxcam capture of region (Windows only, no-op elsewhere).
+
+        capture_screen() calls for exactly this region then return the latest
+        streamed frame instead of grabbing a new one.
+        """
+        if not HAS_DXCAM or not region or self._camera_region is not None:
+            return
+
+        x, y, w, h = region
+        try:
+            if self._camera is None:
+                self._camera = dxcam.create(output_color="BGR")
+            # video_mode repeats the last frame when the screen is static, so
+            # get_latest_frame() never blocks waiting for a change
+            self._camera.start(region=(x, y, x + w, y + h), target_fps=target_fps, video_mode=True)
+        except Exception as e:
+            print(f"Warning: dxcam capture unavailable ({e}), using mss")
+            return
+        self._camera_region = tuple(region)
+
+    def stop_stream(self):
+        """Stop the dxcam capture stream if one is running."""
+        if self._camera_region is not None:
+            self._camera.stop()
+            self._camera_region = None
+
+    def _to_gray(self, screen: np.ndarray) -> np.ndarray:
+        """Grayscale version of a frame, converted once per frame.
+
+        Keyed on the array object: capture_screen() returns a new view for
+        every capture even though the pixels live in a reused buffer.
         """
-        screenshot = pyautogui.screenshot(region=region)
-        frame = np.array(screenshot)
-        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        if screen.ndim == 2:
+            return screen
+        cached = self._frame_cache
+        if cached is not None and cached[0] is screen:
+            return cached[1]
+        gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+        self._frame_cache = (screen, gray, None)
+        return gray
 
-    def find_template(self, screen: np.ndarray, template_name: str, debug: bool = False) -> Optional[Tuple[int, int, float]]:
+    def _fft_inputs(self, screen_gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-frame inputs of the fft matcher, cached with the grayscale frame.
+
+        Returns:
+            (rfft2 spectrum, sum integral image, squared-sum integral image) -
+            shared by every template matched against this frame
+        """
+        cached = self._frame_cache
+        if cached is not None and cached[1] is screen_gray and cached[2] is not None:
+            return cached[2]
+        sums, sq_sums = cv2.integral2(screen_gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+        inputs = (np.fft.rfft2(screen_gray.astype(np.float64)), sums, sq_sums)
+        if cached is not None and cached[1] is screen_gray:
+            self._frame_cache = (cached[0], screen_gray, inputs)
+        return inputs
+
+    def find_template(self, screen: np.ndarray, template_name: str, debug: bool = False,
+                      roi: Optional[Tuple[int, int, int, int]] = None) -> Optional[Tuple[int, int, float]]:
         """Find a template in the screen capture using grayscale matching.
 
+        Args:
+            roi: Optional (x0, y0, x1, y1) box to search instead of the whole screen
+
         Returns:
             Tuple of (x, y, confidence) for center of match, or None if not found
         """
@@ -93,17 +466,73 @@ class ScreenCapture:
                 print(f"[DEBUG] Template '{template_name}' not loaded")
             return None
 
+        if roi:
+            view, x0, y0 = crop_roi(screen, roi)
+            if view is None:
+                return None
+            match = self.find_template(view, template_name, debug)
+            return (match[0] + x0, match[1] + y0, match[2]) if match else None
+
+        # Grayscale matching is more robust (templates are stored pre-converted)
+        return self._cached(screen, ("template", template_name),
+                            lambda: self._find_template_gray(self._to_gray(screen), template_name, debug))
+
+    def find_templates(self, screen: np.ndarray, template_names: List[str], debug: bool = False) -> dict:
+        """Find several templates in the same frame, matching them in parallel.
+
+        OpenCV releases the GIL inside matchTemplate, so each template runs on
+        its own worker thread against one shared grayscale conversion (and,
+        with the fft matcher, one shared forward FFT of the screen). GPU
+        matching runs the templates one after another on the calling thread.
+
+        Returns:
+            Dict of template_name -> (x, y, confidence) or None, for each loaded name
+        """
+        names = [name for name in template_names if name in self.templates]
+        if not names:
+            return {}
+
+        screen_gray = self._to_gray(screen)
+
+        def match(name):
+            return self._cached(screen, ("template", name),
+                                lambda: self._find_template_gray(screen_gray, name, debug))
+
+        # The CUDA matcher and the OpenCL queue are shared, single-stream
+        # objects that aren't safe to drive from several threads - and the
+        # device already parallelises each match - so those run serially
+        if len(names) == 1 or self._gpu_matcher is not None or self._ocl_templates is not None:
+            return {name: match(name) for name in names}
+
+        if self.matcher == "fft":
+            self._fft_inputs(screen_gray)  # One forward FFT for all workers to share
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="match")
+        return dict(zip(names, self._pool.map(match, names)))
+
+    def _find_template_gray(self, screen_gray: np.ndarray, template_name: str, debug: bool = False) -> Optional[Tuple[int, int, float]]:
+        """find_template() on an already grayscale screen."""
         template = self.templates[template_name]
 
-        # Convert both to grayscale for more robust matching
-        screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        if screen_gray.shape[0] < template.shape[0] or screen_gray.shape[1] < template.shape[1]:
+            return None
 
-        result = cv2.matchTemplate(screen_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if self._gpu_matcher is not None:
+            max_val, max_loc = self._match_cuda(screen_gray, template_name)
+        elif self._ocl_templates is not None:
+            result = cv2.matchTemplate(cv2.UMat(screen_gray), self._ocl_templates[template_name], cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        elif self.matcher == "pyramid":
+            max_val, max_loc = self._match_pyramid(screen_gray, template_name)
+        elif self.matcher == "fft":
+            max_val, max_loc = self._match_fft(screen_gray, template_name)
+        else:
+            result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
 
         if debug:
-            print(f"[DEBUG] {template_name}: best_conf={max_val:.3f} threshold={self.confidence} at {max_loc}")
+            print(f"[DEBUG] {template_name}: best_conf={max_val:.3f} threshold={self.confidence} at {max_loc} ({self.matcher})")
 
         if max_val >= self.confidence:
             h, w = template.shape[:2]
@@ -113,6 +542,117 @@ class ScreenCapture:
 
         return None
 
+    def _match_cuda(self, screen_gray: np.ndarray, template_name: str) -> Tuple[float, Tuple[int, int]]:
+        """Run TM_CCOEFF_NORMED on the GPU against the device-resident template.
+
+        Returns:
+            (best_confidence, (x, y)) for the top-left corner of the best match
+        """
+        gpu_screen = cv2.cuda_GpuMat()
+        gpu_screen.upload(screen_gray)
+        result = self._gpu_matcher.match(gpu_screen, self._gpu_templates[template_name])
+        _, max_val, _, max_loc = cv2.cuda.minMaxLoc(result)
+        return max_val, max_loc
+
+    def _match_pyramid(self, screen_gray: np.ndarray, template_name: str, max_level: int = 2,
+                       top_k: int = 5) -> Tuple[float, Tuple[int, int]]:
+        """Coarse-to-fine match: search a downsampled screen, then refine at full resolution.
+
+        The top_k coarse peaks are each refined, since the best coarse hit is
+        not always the best full-resolution one. If the best of them falls
+        just short of the confidence threshold (within PYRAMID_RECHECK_MARGIN)
+        the full screen is matched, in case the real peak was not among them.
+        Clear misses - the common case while polling - skip that full match.
+
+        Returns:
+            (best_confidence, (x, y)) for the top-left corner of the best match
+        """
+        pyramid = self.template_pyramids[template_name]
+        template = pyramid[0]
+        h, w = template.shape[:2]
+        level = min(max_level, len(pyramid) - 1)
+
+        small = screen_gray
+        for _ in range(level):
+            small = cv2.pyrDown(small)
+        coarse = pyramid[level]
+
+        if level == 0 or small.shape[0] < coarse.shape[0] or small.shape[1] < coarse.shape[1]:
+            result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            return max_val, max_loc
+
+        result = cv2.matchTemplate(small, coarse, cv2.TM_CCOEFF_NORMED)
+
+        # Refine in a small window around each coarse peak (+/- 2 coarse pixels)
+        scale = 2 ** level
+        pad = 2 * scale
+        screen_h, screen_w = screen_gray.shape[:2]
+        best_val, best_loc = -1.0, (0, 0)
+        for _ in range(top_k):
+            _, peak_val, _, (coarse_x, coarse_y) = cv2.minMaxLoc(result)
+            if peak_val <= -1.0:
+                break
+            # Suppress this peak so the next iteration finds a different one
+            result[max(coarse_y - pad, 0):coarse_y + pad + 1, max(coarse_x - pad, 0):coarse_x + pad + 1] = -1.0
+
+            x1 = min(coarse_x * scale + pad + w, screen_w)
+            y1 = min(coarse_y * scale + pad + h, screen_h)
+            x0 = min(max(coarse_x * scale - pad, 0), x1 - w)
+            y0 = min(max(coarse_y * scale - pad, 0), y1 - h)
+            refined = cv2.matchTemplate(screen_gray[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, (x, y) = cv2.minMaxLoc(refined)
+            # Near-ties (identical tiles, windowed rounding) go to the earlier
+            # position in raster order, like minMaxLoc over the full screen
+            loc = (x + x0, y + y0)
+            if max_val > best_val + 1e-6 or (max_val > best_val - 1e-6 and loc[::-1] < best_loc[::-1]):
+                best_val, best_loc = max_val, loc
+
+        if self.confidence - PYRAMID_RECHECK_MARGIN <= best_val < self.confidence:
+            result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+            _, best_val, _, best_loc = cv2.minMaxLoc(result)
+        return best_val, best_loc
+
+    def _match_fft(self, screen_gray: np.ndarray, template_name: str) -> Tuple[float, Tuple[int, int]]:
+        """TM_CCOEFF_NORMED computed via FFT correlation and integral-image window sums.
+
+        The template's spectrum depends only on the screen size, which is fixed
+        for a game region, so it is computed once and reused on later frames.
+
+        Returns:
+            (best_confidence, (x, y)) for the top-left corner of the best match
+        """
+        screen_h, screen_w = screen_gray.shape[:2]
+        h, w = self.templates[template_name].shape[:2]
+        n = h * w
+
+        key = (template_name, (screen_h, screen_w))
+        cached = self._tmpl_fft.get(key)
+        if cached is None:
+            tmpl = self.templates[template_name].astype(np.float64)
+            tmpl -= tmpl.mean()
+            cached = (np.conj(np.fft.rfft2(tmpl, s=(screen_h, screen_w))), np.sqrt((tmpl ** 2).sum()))
+            self._tmpl_fft[key] = cached
+        tmpl_spectrum, tmpl_norm = cached
+
+        # The screen's forward FFT and integral images are computed once per
+        # frame and shared by every template matched against it
+        screen_spectrum, sums, sq_sums = self._fft_inputs(screen_gray)
+
+        # Circular correlation is exact for the "valid" offsets we keep
+        numerator = np.fft.irfft2(screen_spectrum * tmpl_spectrum, s=(screen_h, screen_w))[:screen_h - h + 1, :screen_w - w + 1]
+
+        # Per-window sum and sum of squares of the screen in O(1) each
+        window_sum = sums[h:, w:] - sums[:-h, w:] - sums[h:, :-w] + sums[:-h, :-w]
+        window_sq = sq_sums[h:, w:] - sq_sums[:-h, w:] - sq_sums[h:, :-w] + sq_sums[:-h, :-w]
+        window_var = np.maximum(window_sq - window_sum ** 2 / n, 0)
+
+        denominator = np.sqrt(window_var) * tmpl_norm
+        result = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 1e-6)
+
+        y, x = np.unravel_index(np.argmax(result), result.shape)
+        return float(result[y, x]), (int(x), int(y))
+
     def find_all_matches(self, screen: np.ndarray, template_name: str, min_conf: float = None) -> List[Tuple[int, int, float]]:
         """Find all instances of a template in the screen capture.
 
@@ -122,28 +662,102 @@ class ScreenCapture:
         if template_name not in self.templates:
             return []
 
-        template = self.templates[template_name]
-
         # Convert to grayscale for better matching
-        screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-
-        result = cv2.matchTemplate(screen_gray, template_gray, cv2.TM_CCOEFF_NORMED)
+        screen_gray = self._to_gray(screen)
         threshold = min_conf if min_conf is not None else self.confidence
-        locations = np.where(result >= threshold)
+        return self._find_all_matches_gray(screen_gray, template_name, threshold)
 
-        matches = []
-        h, w = template.shape[:2]
+    def _find_all_matches_gray(self, screen_gray: np.ndarray, template_name: str, threshold: float,
+                               max_level: int = 2) -> List[Tuple[int, int, float]]:
+        """find_all_matches() on an already grayscale screen.
 
-        for pt in zip(*locations[::-1]):
-            center_x = pt[0] + w // 2
-            center_y = pt[1] + h // 2
-            conf = result[pt[1], pt[0]]
-            matches.append((center_x, center_y, conf))
+        With the pyramid matcher, candidates come from a downsampled search
+        (PYRAMID_COARSE_MARGIN below the threshold, since detail is lost) and
+        each is confirmed at full resolution in a small window around it. As
+        in _match_pyramid(), if nothing is confirmed but the best candidate
+        came within PYRAMID_RECHECK_MARGIN, the full screen is searched.
+        """
+        pyramid = self.template_pyramids[template_name]
+        template = pyramid[0]
+        h, w = template.shape[:2]
+        screen_h, screen_w = screen_gray.shape[:2]
+        if screen_h < h or screen_w < w:
+            return []
 
-        # Remove duplicate/overlapping matches
+        level = min(max_level, len(pyramid) - 1) if self.matcher == "pyramid" else 0
+        small = screen_gray
+        for _ in range(level):
+            small = cv2.pyrDown(small)
+        coarse = pyramid[level]
+
+        if level == 0 or small.shape[0] < coarse.shape[0] or small.shape[1] < coarse.shape[1]:
+            result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+            ys, xs = np.where(result >= threshold)
+            matches = [(x + w // 2, y + h // 2, float(result[y, x])) for x, y in zip(xs.tolist(), ys.tolist())]
+            return self._remove_duplicates(matches, min_distance=20)
+
+        result = cv2.matchTemplate(small, coarse, cv2.TM_CCOEFF_NORMED)
+        ys, xs = np.where(result >= threshold - PYRAMID_COARSE_MARGIN)
+        candidates = self._remove_duplicates(
+            [(x, y, float(result[y, x])) for x, y in zip(xs.tolist(), ys.tolist())],
+            min_distance=max(20 >> level, 1))
+
+        # Confirm each candidate in a +/- 2 coarse pixel window at full resolution
+        scale = 2 ** level
+        pad = 2 * scale
+        matches = []
+        best_val = -1.0
+        for coarse_x, coarse_y, _ in candidates:
+            x1 = min(coarse_x * scale + pad + w, screen_w)
+            y1 = min(coarse_y * scale + pad + h, screen_h)
+            x0 = min(max(coarse_x * scale - pad, 0), x1 - w)
+            y0 = min(max(coarse_y * scale - pad, 0), y1 - h)
+            result = cv2.matchTemplate(screen_gray[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, (x, y) = cv2.minMaxLoc(result)
+            best_val = max(best_val, max_val)
+            if max_val >= threshold:
+                matches.append((x0 + x + w // 2, y0 + y + h // 2, max_val))
+
+        if not matches and best_val >= threshold - PYRAMID_RECHECK_MARGIN:
+            return self._find_all_matches_gray(screen_gray, template_name, threshold, max_level=0)
         return self._remove_duplicates(matches, min_distance=20)
 
+    def find_shop_items_by_template(self, screen: np.ndarray, targets: list, stock_template: str = "stock_label",
+                                    min_conf: float = 0.85, debug: bool = False) -> Optional[List[Tuple[str, int, int]]]:
+        """Template-matching counterpart of find_shop_items_with_stock().
+
+        Targets are looked up by template name ("Sunflower Seed" ->
+        "sunflower_seed"), and a hit only counts if the stock label template
+        also matches on the same line.
+
+        Returns:
+            List of (item_name, center_x, center_y), or None if the stock label
+            or every target template is missing (caller should use OCR)
+        """
+        names = {target: target.lower().replace(" ", "_") for target in targets}
+        names = {target: name for target, name in names.items() if name in self.templates}
+        if stock_template not in self.templates or not names:
+            return None
+
+        screen_gray = self._to_gray(screen)
+        stock_positions = [y for _, y, _ in self._find_all_matches_gray(screen_gray, stock_template, min_conf)]
+
+        found_items = []
+        if stock_positions:
+            for target, name in names.items():
+                for x, y, conf in self._find_all_matches_gray(screen_gray, name, min_conf):
+                    if any(abs(stock_y - y) < 60 for stock_y in stock_positions):
+                        found_items.append((target, x, y))
+                        if debug:
+                            print(f"[DEBUG] Template matched '{target}' at ({x},{y}) conf={conf:.2f}")
+
+        if debug:
+            print(f"[DEBUG] Template pass: STOCK Y positions {stock_positions}, {len(found_items)} item(s)")
+
+        # Top-to-bottom, like the OCR word order
+        found_items.sort(key=lambda item: (item[2], item[1]))
+        return found_items
+
     def _remove_duplicates(self, matches: List[Tuple[int, int, float]], min_distance: int = 20) -> List[Tuple[int, int, float]]:
         """Remove duplicate matches that are too close together."""
         if not matches:
@@ -151,27 +765,82 @@ class ScreenCapture:
 
         # Sort by confidence (highest first)
         sorted_matches = sorted(matches, key=lambda x: x[2], reverse=True)
+        points = np.array([(m[0], m[1]) for m in sorted_matches], dtype=np.int64)
+        suppressed = np.zeros(len(sorted_matches), dtype=bool)
+        min_dist_sq = min_distance * min_distance
         filtered = []
 
-        for match in sorted_matches:
-            is_duplicate = False
-            for existing in filtered:
-                dist = ((match[0] - existing[0])**2 + (match[1] - existing[1])**2)**0.5
-                if dist < min_distance:
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
-                filtered.append(match)
+        # Greedy suppression: each kept match knocks out everything within
+        # min_distance of it in one vectorized pass (squared distances, no sqrt)
+        for i, match in enumerate(sorted_matches):
+            if suppressed[i]:
+                continue
+            filtered.append(match)
+            offsets = points - points[i]
+            suppressed |= np.einsum("ij,ij->i", offsets, offsets) < min_dist_sq
 
         return filtered
 
     @staticmethod
     def save_screenshot(path: str, region: Optional[Tuple[int, int, int, int]] = None):
         """Save a screenshot for creating templates."""
-        screenshot = pyautogui.screenshot(region=region)
+        screenshot = grab_image(region)
         screenshot.save(path)
         print(f"Screenshot saved to: {path}")
 
+    def ocr_data(self, screen: np.ndarray) -> dict:
+        """Run tesseract on a frame and return its image_to_data() dict.
+
+        Results are cached per frame (see _cached), so repeated text lookups
+        on one frame cost a single OCR pass. With ocr_scale != 1 the frame is
+        resized for tesseract and the boxes are mapped back to frame pixels.
+        """
+        scale = self.ocr_scale
+
+        def run_ocr():
+            # Convert to grayscale and threshold to improve text detection
+            gray = self._to_gray(screen)
+            if scale != 1.0:
+                gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                                  interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC)
+            _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
+            data = pytesseract.image_to_data(thresh, output_type=pytesseract.Output.DICT)
+            if scale != 1.0:
+                for field in ("left", "top", "width", "height"):
+                    data[field] = [int(round(v / scale)) for v in data[field]]
+            return data
+
+        return self._cached(screen, ("ocr", scale), run_ocr)
+
+    def _frame_key(self, screen: np.ndarray) -> tuple:
+        """Checksum key for a frame's pixels (not id(), since capture_screen reuses its buffer)."""
+        cached = self._key_cache
+        if cached is not None and cached[0] is screen:
+            return cached[1]
+        key = (screen.shape, zlib.crc32(np.ascontiguousarray(screen)))
+        self._key_cache = (screen, key)
+        return key
+
+    def _cached(self, screen: np.ndarray, what: tuple, compute):
+        """Return compute()'s result for this frame, reusing it if these exact pixels were seen.
+
+        Keys are pixel checksums, so a click or scroll that changes the screen
+        gives a new key and nothing needs explicit invalidation.
+        """
+        key = (self._frame_key(screen), what)
+        with self._results_lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        value = compute()
+
+        with self._results_lock:
+            self._results[key] = value
+            if len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+        return value
+
     def find_text(self, screen: np.ndarray, search_text: str, debug: bool = False, fuzzy: bool = True) -> Optional[Tuple[int, int, int, int]]:
         """Find text on screen using OCR.
 
@@ -184,14 +853,8 @@ class ScreenCapture:
         Returns:
             Tuple of (x, y, width, height) for the text bounding box, or None if not found
         """
-        # Convert to grayscale for better OCR
-        gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-
-        # Apply threshold to improve text detection
-        _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-
         # Get OCR data with bounding boxes
-        data = pytesseract.image_to_data(thresh, output_type=pytesseract.Output.DICT)
+        data = self.ocr_data(screen)
 
         search_lower = search_text.lower()
         search_words = search_lower.split()
@@ -254,10 +917,7 @@ class ScreenCapture:
         Returns:
             List of (x, y, width, height) tuples for each match
         """
-        gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-
-        data = pytesseract.image_to_data(thresh, output_type=pytesseract.Output.DICT)
+        data = self.ocr_data(screen)
 
         search_lower = search_text.lower()
         matches = []
@@ -305,15 +965,127 @@ class ScreenCapture:
             return (x + w // 2, y + h // 2)
         return None
 
+    def frame_hash(self, screen: np.ndarray) -> int:
+        """64-bit difference hash (dHash) of a frame, for cheap change detection.
+
+        Compare two hashes with (a ^ b).bit_count(); a few differing bits
+        means the frames are visually the same.
+        """
+        gray = self._to_gray(screen)
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    def page_is_empty(self, screen: np.ndarray, min_detail: float = 1.5) -> bool:
+        """True when a frame has almost no edges (a blank or loading panel), so there is nothing to OCR.
+
+        Detail is the mean absolute Laplacian - text rows and item icons score
+        several times higher than a flat panel with compression noise.
+        """
+        gray = self._to_gray(screen)
+        detail = cv2.mean(cv2.convertScaleAbs(cv2.Laplacian(gray, cv2.CV_16S)))[0]
+        return detail < min_detail
+
+    def find_scroll_offset(self, previous: np.ndarray, screen: np.ndarray, strip: int = 100,
+                           min_conf: float = 0.9) -> Optional[int]:
+        """How many pixels the content moved up between two frames of the same region.
+
+        A strip from the middle of `screen` (clear of fixed headers) is matched
+        against the previous frame.
+
+        Returns:
+            Scroll offset in pixels, or None if it couldn't be determined reliably
+            (no movement, low confidence, or a featureless strip)
+        """
+        previous_gray = cv2.cvtColor(previous, cv2.COLOR_BGR2GRAY) if previous.ndim == 3 else previous
+        gray = self._to_gray(screen)
+        if previous_gray.shape != gray.shape:
+            return None
+
+        h = gray.shape[0]
+        strip = min(strip, h // 4)
+        strip_top = h // 3
+        band = gray[strip_top:strip_top + strip]
+        if strip == 0 or band.std() < 5:
+            return None
+
+        result = cv2.matchTemplate(previous_gray, band, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, (_, match_y) = cv2.minMaxLoc(result)
+        offset = match_y - strip_top
+        if max_val < min_conf or offset <= 0:
+            return None
+        return offset
+
+    def _settle_sample(self, region: Optional[Tuple[int, int, int, int]],
+                       roi: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
+        """Grayscale capture of the roi, downscaled 4x, for wait_for_stable()'s frame diffs."""
+        gray = self.capture_screen_gray(region)
+        view, _, _ = crop_roi(gray, roi)
+        if view is None:
+            view = gray
+        h, w = view.shape[:2]
+        # resize() returns a new array, so the reused capture buffer can't alias it
+        return cv2.resize(view, (max(w // 4, 1), max(h // 4, 1)), interpolation=cv2.INTER_AREA)
+
+    def wait_for_stable(self, region: Optional[Tuple[int, int, int, int]] = None, timeout: float = 1.5,
+                        interval: float = 0.05, min_wait: float = 0.1,
+                        roi: Optional[Tuple[int, int, int, int]] = None, tolerance: float = 0.25) -> bool:
+        """Wait until the screen stops changing (e.g. an animation finished).
+
+        Samples the frame every `interval` seconds after an initial `min_wait`
+        (so an animation has time to start) and returns as soon as two
+        consecutive samples differ by less than `tolerance` gray levels on
+        average. Pass `roi` (frame (x0, y0, x1, y1)) to watch only where the
+        animation happens - a small accordion barely moves a whole-frame
+        average.
+
+        Returns:
+            True if the screen settled, False if `timeout` elapsed first
+        """
+        deadline = time.monotonic() + timeout
+        time.sleep(min_wait)
+        last = self._settle_sample(region, roi)
+
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            sample = self._settle_sample(region, roi)
+            if sample.shape == last.shape and cv2.mean(cv2.absdiff(sample, last))[0] < tolerance:
+                return True
+            last = sample
+
+        return False
+
+    def wait_for_transition(self, region: Optional[Tuple[int, int, int, int]], before_hash: int,
+                            timeout: float = 1.5, interval: float = 0.05, min_bits: int = 5) -> bool:
+        """Wait for the screen to change away from `before_hash`, then to settle.
+
+        For waits after a key press that opens or moves something (teleport,
+        shop panel): returns once the new view is still instead of after a
+        fixed worst-case sleep. Both phases share one `timeout`.
+
+        Returns:
+            True if the screen changed and settled, False if `timeout` elapsed first
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if (self.frame_hash(self.capture_screen_gray(region)) ^ before_hash).bit_count() >= min_bits:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+
+        remaining = deadline - time.monotonic()
+        return remaining > 0 and self.wait_for_stable(region, timeout=remaining, interval=interval,
+                                                      min_wait=min(interval, remaining))
+
     def find_shop_items_with_stock(self, screen: np.ndarray, targets: list, debug: bool = False) -> List[Tuple[str, int, int]]:
         """Find shop items that have STOCK visible on the same line.
 
         Returns:
             List of (item_name, center_x, center_y) for items with STOCK nearby
         """
-        gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-        data = pytesseract.image_to_data(thresh, output_type=pytesseract.Output.DICT)
+        data = self.ocr_data(screen)
 
         n_boxes = len(data['text'])
         found_items = []
@@ -349,6 +1121,14 @@ class ScreenCapture:
                             patterns.append(substring)
             target_patterns[target] = patterns
 
+        # Distinguishing words for the rapidfuzz fallback, built once per scan
+        fuzzy_choices = {}
+        if HAS_RAPIDFUZZ:
+            for target in targets:
+                for word in target.lower().split():
+                    if len(word) >= 5 and word not in common_words:
+                        fuzzy_choices.setdefault(word, target)
+
         if debug:
             print(f"[DEBUG] Fuzzy patterns: {target_patterns}")
 
@@ -396,6 +1176,15 @@ class ScreenCapture:
                     if debug:
                         print(f"[DEBUG] Matched '{text}' to '{target}'")
                     break  # Don't match same text to multiple targets
+            else:
+                # No substring match - accept a near miss on a distinguishing word
+                if fuzzy_choices and len(text) >= 5:
+                    best = rf_process.extractOne(text, fuzzy_choices.keys(), scorer=rf_fuzz.ratio, score_cutoff=85)
+                    if best:
+                        target = fuzzy_choices[best[0]]
+                        found_items.append((target, item_x, item_y))
+                        if debug:
+                            print(f"[DEBUG] Fuzzy matched '{text}' to '{target}' ({best[1]:.0f})")
 
         return found_items
 
@@ -411,7 +1200,8 @@ class ScreenCapture:
         rgb = cv2.cvtColor(screen, cv2.COLOR_BGR2RGB)
 
         # Run OCR
-        results = reader.readtext(rgb)
+        with easyocr_precision(self.use_fp16):
+            results = reader.readtext(rgb)
 
         if debug:
             all_text = [text for (_, text, _) in results]
@@ -430,6 +1220,12 @@ class ScreenCapture:
 
         return None
 
+    def warm_up_easyocr(self):
+        """Load easyocr and run one dummy frame so the first real call is fast."""
+        reader = get_easyocr_reader()
+        with easyocr_precision(self.use_fp16):
+            reader.readtext(np.zeros((640, 640, 3), dtype=np.uint8))
+
     def get_text_center_easyocr(self, screen: np.ndarray, search_text: str, debug: bool = False) -> Optional[Tuple[int, int]]:
         """Find text using EasyOCR and return center coordinates."""
         result = self.find_text_easyocr(screen, search_text, debug=debug)
@@ -438,57 +1234,86 @@ class ScreenCapture:
             return (x + w // 2, y + h // 2)
         return None
 
-    def find_green_buttons(self, screen: np.ndarray, debug: bool = False) -> List[Tuple[int, int]]:
+    def find_green_buttons(self, screen: np.ndarray, debug: bool = False,
+                           roi: Optional[Tuple[int, int, int, int]] = None) -> List[Tuple[int, int]]:
         """Find green buy buttons by color detection.
 
+        Args:
+            screen: Screenshot as numpy array in BGR format
+            debug: If True, print contour diagnostics
+            roi: Optional (x0, y0, x1, y1) box to search instead of the whole screen
+
         Returns:
-            List of (center_x, center_y) for each green button found
+            List of (center_x, center_y) for each green button found, in screen coordinates
         """
-        # Convert to HSV for better color detection
-        hsv = cv2.cvtColor(screen, cv2.COLOR_BGR2HSV)
-
-        # The buy button green (extracted from template: H=53, S=153, V=172)
-        # Use a range around these values
-        lower_green = np.array([43, 100, 120])  # Widened range for PC
-        upper_green = np.array([75, 255, 255])
-
-        # Create mask for green pixels
-        mask = cv2.inRange(hsv, lower_green, upper_green)
-
-        # Find contours (connected green regions)
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Area thresholds are scaled by the full frame, not the ROI
+        screen_h, screen_w = screen.shape[:2]
+        screen, offset_x, offset_y = crop_roi(screen, roi)
+        if screen is None:
+            return []
 
         # Scale area thresholds based on screen size (Mac baseline: 645x534)
-        screen_h, screen_w = screen.shape[:2]
         scale = (screen_w * screen_h) / (645 * 534)
         min_area = int(500 * scale)
         max_area = int(10000 * scale)
 
         if debug:
-            print(f"[DEBUG] Screen {screen_w}x{screen_h}, scale={scale:.2f}, area range={min_area}-{max_area}")
+            print(f"[DEBUG] Screen {screen_w}x{screen_h}, roi={roi}, scale={scale:.2f}, area range={min_area}-{max_area}")
 
-        buttons = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            # Filter by size - scaled for screen resolution
-            if area > min_area and area < max_area:
-                x, y, w, h = cv2.boundingRect(contour)
-                # Buy button should be wider than tall (rectangular, not labels like "uncommon")
-                # Require width > height (true button shape)
-                if w > h * 1.2:
-                    center_x = x + w // 2
-                    center_y = y + h // 2
-                    buttons.append((center_x, center_y, area))
-                    if debug:
-                        print(f"[DEBUG] Green button at ({center_x},{center_y}) size={w}x{h} area={area} ratio={w/h:.2f}")
-                elif debug:
-                    print(f"[DEBUG] Rejected shape: size={w}x{h} ratio={w/h:.2f} (need w > h*1.2)")
-            elif debug and area > 100:
-                print(f"[DEBUG] Rejected contour: area={area} (need {min_area}-{max_area})")
+        # The buy button green (extracted from template: H=53, S=153, V=172)
+        # Use a range around these values
+        lower_green = np.array([43, 100, 120])  # Widened range for PC
+        upper_green = np.array([75, 255, 255])
+
+        # Find candidate regions at half resolution - a quarter of the pixels
+        # through cvtColor/inRange, and buttons are far larger than 2x2 blocks
+        small_w, small_h = screen.shape[1] // 2, screen.shape[0] // 2
+        if small_w == 0 or small_h == 0:
+            return []
+        small = cv2.resize(screen, (small_w, small_h), interpolation=cv2.INTER_AREA)
+        small_mask = cv2.inRange(cv2.cvtColor(small, cv2.COLOR_BGR2HSV), lower_green, upper_green)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(small_mask, connectivity=8)
+
+        # An outer contour never has more area than its bounding box, so
+        # regions whose box is too small can't pass the area filter below
+        stats = stats[1:]
+        box_area = stats[:, cv2.CC_STAT_WIDTH].astype(np.int64) * stats[:, cv2.CC_STAT_HEIGHT] * 4
+        candidates = stats[box_area > min_area]
+
+        # Measure each candidate at full resolution, in a window padded so
+        # the half-resolution rounding can't clip it
+        buttons = {}
+        pad = 4
+        full_h, full_w = screen.shape[:2]
+        for left, top, width, height, _ in candidates.tolist():
+            wx0, wy0 = max(left * 2 - pad, 0), max(top * 2 - pad, 0)
+            wx1, wy1 = min((left + width) * 2 + pad, full_w), min((top + height) * 2 + pad, full_h)
+            hsv = cv2.cvtColor(screen[wy0:wy1, wx0:wx1], cv2.COLOR_BGR2HSV)
+            mask = cv2.inRange(hsv, lower_green, upper_green)
+
+            # Find contours (connected green regions)
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            for contour in contours:
+                area = cv2.contourArea(contour)
+                # Filter by size - scaled for screen resolution
+                if area > min_area and area < max_area:
+                    x, y, w, h = cv2.boundingRect(contour)
+                    # Buy button should be wider than tall (rectangular, not labels like "uncommon")
+                    # Require width > height (true button shape)
+                    if w > h * 1.2:
+                        center_x = offset_x + wx0 + x + w // 2
+                        center_y = offset_y + wy0 + y + h // 2
+                        # Neighbouring windows can overlap and see the same button
+                        buttons[(center_x, center_y)] = area
+                        if debug:
+                            print(f"[DEBUG] Green button at ({center_x},{center_y}) size={w}x{h} area={area} ratio={w/h:.2f}")
+                    elif debug:
+                        print(f"[DEBUG] Rejected shape: size={w}x{h} ratio={w/h:.2f} (need w > h*1.2)")
+                elif debug and area > 100:
+                    print(f"[DEBUG] Rejected contour: area={area} (need {min_area}-{max_area})")
 
         # Sort by area (largest first) and return centers only
-        buttons.sort(key=lambda b: b[2], reverse=True)
-        return [(x, y) for x, y, _ in buttons]
+        return sorted(buttons, key=buttons.get, reverse=True)
 
     def find_close_button(self, screen: np.ndarray, debug: bool = False) -> Optional[Tuple[int, int]]:
         """Find white X close button for dismissing pop-ups.